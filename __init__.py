@@ -10,7 +10,9 @@ import bpy
 import os
 from .rdc_importer import import_meshes_from_rdc # RD capture importer logic
 from .fbx_importer import ImportFBXOperator  # Import the FBX operator
-from .mesh_matcher import MatchMeshesOperator, ApplyMaterialsConstraintsOperator, HideConstraintObjectsOperator, ShowConstraintObjectsOperator, ManualMatchOperator # Matching and materials logic
+from .kn5_importer import ImportKN5Operator  # Native reader for unencrypted kn5 files
+from .mesh_matcher import MatchMeshesOperator, ApplyMaterialsConstraintsOperator, HideConstraintObjectsOperator, ShowConstraintObjectsOperator, ManualMatchOperator, ClearMatchesOperator # Matching and materials logic
+from .match_table import RDAC_MatchItem, update_match_preview  # Scene table holding the matched pairs
 from .mesh_renamer import OBJECT_OT_RenameAndReparentMeshes  # Import the new renaming and reparenting operator
 from .ini_processor import main_ini_processer  # Import the main function for INI processing
 
@@ -58,24 +60,44 @@ class RENDERDOC_PT_ACImporter(bpy.types.Panel):
         else:
             layout.prop(scene, "manual_action_ranges", text="Action Ranges")
 
+        layout.prop(scene, "compact_meshes", text="Compact Meshes")
+
         # Button to run the import process
         layout.separator()
         layout.operator("renderdoc_ac_importer.run_import", text="Import RDC File")
 
-        # FBX Importer section
+        # kn5 Importer section
         layout.separator()
-        layout.label(text="FBX Importer:")
+        layout.label(text="kn5 Importer:")
+        layout.operator("import_scene.kn5", text="Import KN5")
         layout.operator("import_scene.fbx_kn5", text="Import FBX")
 
         # Mesh Matching section
         layout.separator()
         layout.label(text="Mesh Matching:")
-        layout.prop(scene, "matching_threshold", text="Matching Threshold")
+        layout.prop(scene, "matching_mode", text="Mode")
+        if scene.matching_mode == 'OVERLAP':
+            layout.prop(scene, "overlap_voxel_size", text="Voxel Size")
+            layout.prop(scene, "overlap_min_fraction", text="Min Overlap")
+        else:
+            layout.prop(scene, "matching_threshold", text="Matching Threshold")
+            layout.prop(scene, "auto_threshold", text="Automatic Threshold")
+            layout.prop(scene, "verify_matches", text="Verify Matches")
+            layout.prop(scene, "texture_matching", text="Compare Textures")
+            layout.prop(scene, "matching_processes", text="Worker Processes")
+        layout.prop(scene, "incremental_matching", text="Only Unmatched Objects")
         layout.operator("mesh_matcher.match_meshes", text="Match Meshes (AUTO)")
         layout.operator("mesh_matcher.manual_match", text="Match Meshes (MANUAL)")
+        layout.label(text=f"Matched Pairs: {len(scene.rdac_matches)}")
+        layout.prop(scene, "preview_matches", text="Preview Matches")
+        layout.operator("mesh_matcher.clear_matches", text="Clear Matches")
         layout.separator()
-        layout.operator("mesh_matcher.hide_constraint_objects", text="Hide Objects")
-        layout.operator("mesh_matcher.show_constraint_objects", text="Show Objects")
+        row = layout.row(align=True)
+        row.operator("mesh_matcher.hide_constraint_objects", text="Hide Matched").match_set = 'MATCHED'
+        row.operator("mesh_matcher.show_constraint_objects", text="Show Matched").match_set = 'MATCHED'
+        row = layout.row(align=True)
+        row.operator("mesh_matcher.hide_constraint_objects", text="Hide Unmatched").match_set = 'UNMATCHED'
+        row.operator("mesh_matcher.show_constraint_objects", text="Show Unmatched").match_set = 'UNMATCHED'
 
         # Apply Materials and Constraints
         layout.separator()
@@ -104,13 +126,14 @@ class RENDERDOC_OT_RunImport(bpy.types.Operator):
         min_action_id = scene.min_action_id if scene.max_action_id >= 0 else None
         max_action_id = scene.max_action_id
         manual_ranges = scene.manual_action_ranges if max_action_id == -1 else ""
+        compact_meshes = scene.compact_meshes
 
         if not rdc_file_path:
             self.report({'ERROR'}, "Please select an RDC file.")
             return {'CANCELLED'}
 
         # Call the mane function to bring the files in
-        import_meshes_from_rdc(rdc_file_path, min_action_id, max_action_id, manual_ranges)
+        import_meshes_from_rdc(rdc_file_path, min_action_id, max_action_id, manual_ranges, compact_meshes)
         return {'FINISHED'}
 
 # Function to handle file selection
@@ -148,6 +171,12 @@ def init_properties():
         default=""
     )
 
+    bpy.types.Scene.compact_meshes = bpy.props.BoolProperty(
+        name="Compact Meshes",
+        description="Drop vertices no triangle uses and weld exact duplicates after decoding. Vertex counts can then differ from the kn5 meshes used for matching",
+        default=False
+    )
+
     bpy.types.Scene.matching_threshold = bpy.props.FloatProperty(
         name="Matching Threshold",
         description="Threshold for matching RenderDoc meshes to the loaded kn5. The lower the number, the more accurate the matches should be. Set higher for less accuracy but more matches",
@@ -155,6 +184,76 @@ def init_properties():
         min=0.00001
     )
 
+    bpy.types.Scene.auto_threshold = bpy.props.BoolProperty(
+        name="Automatic Threshold",
+        description="Pick the matching threshold from the gap between close and far candidates in a single matching run, and store it in Matching Threshold. The current threshold is kept when there is no clear gap",
+        default=False
+    )
+
+    bpy.types.Scene.matching_mode = bpy.props.EnumProperty(
+        name="Matching Mode",
+        description="How RDC meshes are paired with kn5 meshes",
+        items=[
+            ('FINGERPRINT', "Exact", "Pair meshes with the same vertex count and shape one to one"),
+            ('OVERLAP', "Overlap", "Pair each RDC mesh with the kn5 mesh its vertices overlap. Use when the game splits meshes into several draws"),
+        ],
+        default='FINGERPRINT'
+    )
+
+    bpy.types.Scene.overlap_voxel_size = bpy.props.FloatProperty(
+        name="Voxel Size",
+        description="Size of the cells vertex positions are snapped to in overlap mode. Vertices closer than half a cell count as overlapping",
+        default=0.01,
+        min=0.00001
+    )
+
+    bpy.types.Scene.overlap_min_fraction = bpy.props.FloatProperty(
+        name="Min Overlap",
+        description="Fraction of an RDC mesh's vertices that must overlap a kn5 mesh in overlap mode",
+        default=0.95,
+        min=0.0,
+        max=1.0,
+        subtype='FACTOR'
+    )
+
+    bpy.types.Scene.incremental_matching = bpy.props.BoolProperty(
+        name="Incremental Matching",
+        description="Skip objects already paired by a match and only consider unmatched kn5 meshes and newly imported RDC meshes",
+        default=False
+    )
+
+    bpy.types.Scene.verify_matches = bpy.props.BoolProperty(
+        name="Verify Matches",
+        description="Check each candidate pair with a rigid fit of a vertex subsample and reject pairs that do not line up. Allows a looser matching threshold without false matches",
+        default=False
+    )
+
+    bpy.types.Scene.texture_matching = bpy.props.BoolProperty(
+        name="Compare Textures",
+        description="When several RDC meshes fit a kn5 mesh equally well, use the size and sampled pixels of their textures to tell them apart. Reads each texture once and caches the result on the image",
+        default=False
+    )
+
+    bpy.types.Scene.matching_processes = bpy.props.IntProperty(
+        name="Worker Processes",
+        description="Number of processes used to fingerprint and verify meshes on large scenes. 1 keeps all work inside Blender, 0 uses one per CPU core",
+        default=1,
+        min=0
+    )
+
+    bpy.types.Scene.rdac_matches = bpy.props.CollectionProperty(
+        type=RDAC_MatchItem,
+        name="Matches",
+        description="Pairs of RDC and kn5 objects found by mesh matching"
+    )
+
+    bpy.types.Scene.preview_matches = bpy.props.BoolProperty(
+        name="Preview Matches",
+        description="Temporarily move every matched RDC object onto its kn5 object with a constraint. Slows down the viewport on large scenes",
+        default=False,
+        update=update_match_preview
+    )
+
     bpy.types.Scene.debug_flag = bpy.props.BoolProperty(
         name="Debug Flag",
         description="If enabled prevents deletion of create or move actions. If disabled actions will delete objects where needed. Be sure to save before disabling",
@@ -167,14 +266,27 @@ def clear_properties():
     del bpy.types.Scene.min_action_id
     del bpy.types.Scene.max_action_id
     del bpy.types.Scene.matching_threshold
+    del bpy.types.Scene.auto_threshold
+    del bpy.types.Scene.matching_mode
+    del bpy.types.Scene.overlap_voxel_size
+    del bpy.types.Scene.overlap_min_fraction
+    del bpy.types.Scene.incremental_matching
+    del bpy.types.Scene.verify_matches
+    del bpy.types.Scene.matching_processes
+    del bpy.types.Scene.texture_matching
+    del bpy.types.Scene.rdac_matches
+    del bpy.types.Scene.preview_matches
     del bpy.types.Scene.debug_flag
     del bpy.types.Scene.manual_action_ranges
+    del bpy.types.Scene.compact_meshes
 
 # Register and Unregister functions
 classes = [
+    RDAC_MatchItem,  # Must be registered before the scene property using it
     RENDERDOC_PT_ACImporter,
     RENDERDOC_OT_RunImport,
     ImportFBXOperator,  # Register the FBX import operator
+    ImportKN5Operator,
     MatchMeshesOperator,
     ApplyMaterialsConstraintsOperator,
     OBJECT_OT_RenameAndReparentMeshes,  # Register the new renaming and reparenting operator
@@ -182,6 +294,7 @@ classes = [
     HideConstraintObjectsOperator,  
     ShowConstraintObjectsOperator,
     ManualMatchOperator,
+    ClearMatchesOperator,
 ]
 
 def register():
@@ -0,0 +1,278 @@
+"""
+Offline benchmark for mesh matching.
+
+Builds synthetic 'kn5' and 'RDC' collections inside headless Blender, runs the
+matcher on them and scores the result against the known ground truth:
+
+    blender -b --factory-startup --python-exit-code 1 -P benchmarks/bench_matching.py -- \
+        --objects 5000 --vertices 200 --cluster-size 8 --mirrored 0.3 --noise 1e-5 --verify
+
+Every kn5 object gets an RDC twin with the same vertices plus optional noise.
+Clusters of identical shapes at different positions and mirrored copies of a
+cluster on the other side of the X axis reproduce the bolts, wheels and
+left/right parts that make real scenes hard to match.
+
+Reports the scene build and matching times, per-stage timings with the peak RSS
+growth observed while each stage was running, and precision and recall of the
+matches in the scene's match table.
+
+bpy is only imported inside the functions: the matcher's worker processes
+re-run this script as their main module, outside of Blender.
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+
+# Stages of the matcher that get wrapped with timers, in pipeline order
+STAGES = [
+    "compute_fingerprints",
+    "build_fingerprint_buckets",
+    "score_candidate_pairs",
+    "assign_candidates",
+    "build_voxel_table",
+    "score_overlaps",
+    "assign_overlaps",
+    "update_match_collections",
+]
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Benchmark match_meshes on synthetic kn5 and RDC collections.")
+    parser.add_argument("--objects", type=int, default=100, help="Number of kn5 objects")
+    parser.add_argument("--vertices", type=int, default=100, help="Approximate vertex count per object")
+    parser.add_argument("--cluster-size", type=int, default=1,
+                        help="Objects sharing one shape and vertex count at different positions")
+    parser.add_argument("--mirrored", type=float, default=0.0,
+                        help="Fraction of clusters that also get a copy mirrored across the X axis")
+    parser.add_argument("--noise", type=float, default=0.0, help="Standard deviation of the noise added to RDC vertices")
+    parser.add_argument("--missing", type=float, default=0.0, help="Fraction of kn5 objects without an RDC twin")
+    parser.add_argument("--extra", type=int, default=0, help="RDC objects without a kn5 twin")
+    parser.add_argument("--spacing", type=float, default=3.0, help="Distance between neighbouring objects")
+    parser.add_argument("--mode", choices=("exact", "overlap"), default="exact", help="Matching mode to run")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Matching threshold of the exact mode")
+    parser.add_argument("--auto-threshold", action="store_true", help="Pick the threshold from the candidate distances")
+    parser.add_argument("--verify", action="store_true", help="Verify candidates with rigid fits")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes, 0 for one per CPU core")
+    parser.add_argument("--voxel-size", type=float, default=0.01, help="Voxel size of the overlap mode")
+    parser.add_argument("--min-overlap", type=float, default=0.95, help="Minimum overlap of the overlap mode")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--log", action="store_true", help="Keep the matcher's per-object logging enabled")
+    parser.add_argument("--json", help="Write the report to this file as JSON")
+    return parser.parse_args(argv)
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def load_addon():
+    """
+    Installs the stand-in renderdoc module, imports the add-on as a package and
+    registers it so the scene properties used by the matcher exist.
+    """
+    sys.path.insert(0, BENCH_DIR)
+    import fake_renderdoc
+    sys.modules["renderdoc"] = fake_renderdoc
+
+    sys.path.insert(0, os.path.dirname(ADDON_DIR))
+    package_name = os.path.basename(ADDON_DIR)
+    addon = importlib.import_module(package_name)
+    addon.register()
+    return importlib.import_module(f"{package_name}.mesh_matcher")
+
+
+def instrument(module, stats):
+    """
+    Replaces each stage function on the module with a wrapper recording call
+    count, wall time and peak RSS growth. Stages the selected mode never calls
+    keep zero calls.
+    """
+    for stage in STAGES:
+        original = getattr(module, stage)
+        stats[stage] = {"calls": 0, "seconds": 0.0, "rss_growth_mb": 0.0}
+
+        def wrapper(*args, _original=original, _stats=stats[stage], **kwargs):
+            rss_before = peak_rss_mb()
+            start = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                _stats["seconds"] += time.perf_counter() - start
+                _stats["rss_growth_mb"] += peak_rss_mb() - rss_before
+                _stats["calls"] += 1
+
+        setattr(module, stage, wrapper)
+
+
+def make_shape(vertex_count, rng):
+    """
+    Returns the vertices and triangles of a random height field with roughly
+    vertex_count vertices, centered on the origin.
+    """
+    columns = max(2, int(vertex_count ** 0.5))
+    rows = max(2, vertex_count // columns)
+    scale = rng.uniform(0.2, 1.0, size=3)
+
+    x, y = np.meshgrid(np.linspace(-0.5, 0.5, columns), np.linspace(-0.5, 0.5, rows))
+    z = rng.normal(0.0, 0.1, size=x.shape)
+    coords = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1) * scale
+
+    a = (np.arange(rows - 1)[:, None] * columns + np.arange(columns - 1)[None, :]).ravel()
+    faces = np.concatenate([np.stack([a, a + columns, a + 1], axis=1), np.stack([a + 1, a + columns, a + columns + 1], axis=1)])
+    return coords, faces
+
+
+def make_object(name, coords, faces, collection):
+    import bpy
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(coords.tolist(), [], faces.tolist())
+    obj = bpy.data.objects.new(name, mesh)
+    collection.objects.link(obj)
+    return obj
+
+
+def get_collection(name):
+    import bpy
+    collection = bpy.data.collections.get(name)
+    if not collection:
+        collection = bpy.data.collections.new(name)
+        bpy.context.scene.collection.children.link(collection)
+    return collection
+
+
+def build_scene(args):
+    """
+    Creates the kn5 and RDC collections and returns the ground truth as a
+    dictionary mapping RDC object names to kn5 object names.
+    """
+    rng = np.random.default_rng(args.seed)
+    kn5_collection = get_collection("kn5")
+    rdc_collection = get_collection("RDC")
+
+    # Lay the objects out on a grid in the positive X half, mirrored copies go to the negative half
+    grid = int(np.ceil(args.objects ** (1.0 / 3.0))) or 1
+    kn5_parts = []
+    while len(kn5_parts) < args.objects:
+        coords, faces = make_shape(args.vertices + int(rng.integers(0, args.vertices // 4 + 1)), rng)
+        mirrored = rng.random() < args.mirrored
+        for _ in range(args.cluster_size):
+            if len(kn5_parts) >= args.objects:
+                break
+            cell = len(kn5_parts)
+            offset = (np.array([cell % grid, cell // grid % grid, cell // grid // grid]) + [1.0, 0.0, 0.0]) * args.spacing
+            offset += rng.uniform(-0.1, 0.1, size=3) * args.spacing
+            kn5_parts.append((coords + offset, faces))
+            if mirrored and len(kn5_parts) < args.objects:
+                # Reflect across the YZ plane and flip the winding to keep the faces outward
+                kn5_parts.append(((coords + offset) * [-1.0, 1.0, 1.0], faces[:, ::-1]))
+
+    truth = {}
+    rdc_parts = []
+    for index, (coords, faces) in enumerate(kn5_parts):
+        kn5_name = f"kn5_{index}"
+        make_object(kn5_name, coords, faces, kn5_collection)
+        if rng.random() >= args.missing:
+            noise = rng.normal(0.0, args.noise, size=coords.shape) if args.noise else 0.0
+            rdc_parts.append((kn5_name, coords + noise, faces))
+
+    for _ in range(args.extra):
+        coords, faces = make_shape(args.vertices, rng)
+        rdc_parts.append((None, coords + rng.uniform(-grid, grid, size=3) * args.spacing, faces))
+
+    # Create the RDC side in draw order unrelated to the kn5 order
+    for draw, index in enumerate(rng.permutation(len(rdc_parts))):
+        kn5_name, coords, faces = rdc_parts[index]
+        obj = make_object(f"Mesh_{draw}", coords, faces, rdc_collection)
+        if kn5_name:
+            truth[obj.name] = kn5_name
+
+    return truth
+
+
+def score_matches(scene, truth):
+    predicted = [(item.rdc_object.name, item.kn5_object.name) for item in scene.rdac_matches if item.rdc_object and item.kn5_object]
+    correct = sum(1 for rdc_name, kn5_name in predicted if truth.get(rdc_name) == kn5_name)
+    return {
+        "predicted": len(predicted),
+        "expected": len(truth),
+        "correct": correct,
+        "precision": correct / len(predicted) if predicted else 1.0,
+        "recall": correct / len(truth) if truth else 1.0,
+    }
+
+
+def main():
+    args = parse_args()
+    import bpy
+
+    if not args.log:
+        logging.getLogger().addHandler(logging.NullHandler())
+        logging.getLogger().setLevel(logging.WARNING)
+
+    mesh_matcher = load_addon()
+    scene = bpy.context.scene
+    scene.matching_threshold = args.threshold
+
+    rss_start = peak_rss_mb()
+    start = time.perf_counter()
+    truth = build_scene(args)
+    build_seconds = time.perf_counter() - start
+
+    stats = {}
+    instrument(mesh_matcher, stats)
+
+    kn5_collection = bpy.data.collections["kn5"]
+    rdc_collection = bpy.data.collections["RDC"]
+    rss_before_matching = peak_rss_mb()
+    start = time.perf_counter()
+    if args.mode == "overlap":
+        mesh_matcher.match_meshes_by_overlap(kn5_collection, rdc_collection, args.voxel_size, args.min_overlap)
+    else:
+        mesh_matcher.match_meshes(kn5_collection, rdc_collection, args.threshold, False, args.verify, args.processes,
+                                  args.auto_threshold)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "config": vars(args),
+        "build_seconds": build_seconds,
+        "seconds": elapsed,
+        "threshold": scene.matching_threshold,
+        "objects_per_second": args.objects / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "scene_rss_growth_mb": rss_before_matching - rss_start,
+        "rss_growth_mb": peak_rss_mb() - rss_before_matching,
+        "accuracy": score_matches(scene, truth),
+        "stages": stats,
+    }
+
+    accuracy = report["accuracy"]
+    print(f"Built {args.objects} kn5 / {len(rdc_collection.all_objects)} RDC objects in {build_seconds:.3f}s")
+    print(f"Matched in {elapsed:.3f}s ({report['objects_per_second']:.0f} objects/s), threshold {report['threshold']:.6g}")
+    print(f"  precision {accuracy['precision']:.4f}, recall {accuracy['recall']:.4f} "
+          f"({accuracy['correct']} correct of {accuracy['predicted']} predicted, {accuracy['expected']} expected)")
+    print(f"  peak RSS {report['peak_rss_mb']:.1f} MB (+{report['rss_growth_mb']:.1f} MB during matching)")
+    for stage in STAGES:
+        stage_stats = stats[stage]
+        if stage_stats["calls"]:
+            print(f"  {stage:<28} {stage_stats['calls']:>7} calls {stage_stats['seconds']:>9.3f}s "
+                  f"peak RSS +{stage_stats['rss_growth_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
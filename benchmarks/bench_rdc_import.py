@@ -0,0 +1,155 @@
+"""
+Offline benchmark for the RDC import path.
+
+Drives import_meshes_from_rdc end to end inside headless Blender against the
+synthetic capture served by fake_renderdoc, so import throughput can be
+measured on Linux without Windows or a real capture:
+
+    blender -b --factory-startup --python-exit-code 1 -P benchmarks/bench_rdc_import.py -- \
+        --actions 500 --vertices 5000 --stride 44 --shared-ratio 0.25 --textures 3
+
+Reports actions/s, vertices/s and per-stage timings with the peak RSS growth
+observed while each stage was running.
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+
+# Stages of the import that get wrapped with timers, in pipeline order
+STAGES = [
+    "extract_and_save_textures",
+    "create_or_get_material",
+    "assign_textures_to_nodes",
+    "extract_and_import_mesh",
+    "create_mesh_in_blender",
+]
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(description="Benchmark import_meshes_from_rdc on a synthetic capture.")
+    parser.add_argument("--actions", type=int, default=100, help="Number of draw actions in the capture")
+    parser.add_argument("--vertices", type=int, default=2000, help="Approximate vertex count per draw")
+    parser.add_argument("--stride", type=int, default=32, help="Vertex buffer stride in bytes (>= 32)")
+    parser.add_argument("--shared-ratio", type=float, default=0.0,
+                        help="Fraction of draws that reuse the previous draw's buffers")
+    parser.add_argument("--textures", type=int, default=2, help="Texture bindings per draw")
+    parser.add_argument("--texture-pool", type=int, default=16, help="Distinct textures in the capture")
+    parser.add_argument("--texture-size", type=int, default=4, help="Width and height of every texture")
+    parser.add_argument("--strips", action="store_true", help="Emit triangle strips with restart indices")
+    parser.add_argument("--compact", action="store_true", help="Enable vertex compaction after decode")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--log", action="store_true", help="Keep the importer's per-action logging enabled")
+    parser.add_argument("--json", help="Write the report to this file as JSON")
+    return parser.parse_args(argv)
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def load_importer():
+    """
+    Installs the stand-in renderdoc module and imports the add-on's
+    rdc_importer as part of its package.
+    """
+    sys.path.insert(0, BENCH_DIR)
+    import fake_renderdoc
+    sys.modules["renderdoc"] = fake_renderdoc
+
+    sys.path.insert(0, os.path.dirname(ADDON_DIR))
+    package_name = os.path.basename(ADDON_DIR)
+    return fake_renderdoc, importlib.import_module(f"{package_name}.rdc_importer")
+
+
+def instrument(module, stats):
+    """
+    Replaces each stage function on the module with a wrapper recording call
+    count, wall time and peak RSS growth. Stages nest (mesh creation runs
+    inside mesh extraction), so timings are inclusive.
+    """
+    for stage in STAGES:
+        original = getattr(module, stage)
+        stats[stage] = {"calls": 0, "seconds": 0.0, "rss_growth_mb": 0.0}
+
+        def wrapper(*args, _original=original, _stats=stats[stage], **kwargs):
+            rss_before = peak_rss_mb()
+            start = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                _stats["seconds"] += time.perf_counter() - start
+                _stats["rss_growth_mb"] += peak_rss_mb() - rss_before
+                _stats["calls"] += 1
+
+        setattr(module, stage, wrapper)
+
+
+def main():
+    args = parse_args()
+    import bpy
+
+    if not args.log:
+        # setup_logging only configures the root logger when it has no handlers
+        logging.getLogger().addHandler(logging.NullHandler())
+        logging.getLogger().setLevel(logging.WARNING)
+
+    fake_renderdoc, rdc_importer = load_importer()
+    fake_renderdoc.configure(
+        actions=args.actions, vertices=args.vertices, stride=args.stride,
+        shared_buffer_ratio=args.shared_ratio, textures_per_action=args.textures,
+        texture_pool=args.texture_pool, texture_size=args.texture_size, strips=args.strips,
+        seed=args.seed,
+    )
+
+    stats = {}
+    instrument(rdc_importer, stats)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        rdc_file_path = os.path.join(output_dir, "synthetic.rdc")
+        rss_start = peak_rss_mb()
+        start = time.perf_counter()
+        rdc_importer.import_meshes_from_rdc(rdc_file_path, None, -1, "", args.compact)
+        elapsed = time.perf_counter() - start
+
+    rdc_collection = bpy.data.collections.get("RDC")
+    meshes = [obj for obj in rdc_collection.objects if obj.type == 'MESH'] if rdc_collection else []
+    vertex_total = sum(len(obj.data.vertices) for obj in meshes)
+
+    report = {
+        "config": vars(args),
+        "seconds": elapsed,
+        "meshes": len(meshes),
+        "vertices": vertex_total,
+        "actions_per_second": args.actions / elapsed if elapsed else 0.0,
+        "vertices_per_second": vertex_total / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_growth_mb": peak_rss_mb() - rss_start,
+        "stages": stats,
+    }
+
+    print(f"Imported {report['meshes']} meshes / {vertex_total} vertices in {elapsed:.3f}s")
+    print(f"  {report['actions_per_second']:.1f} actions/s, {report['vertices_per_second']:.0f} vertices/s")
+    print(f"  peak RSS {report['peak_rss_mb']:.1f} MB (+{report['rss_growth_mb']:.1f} MB during import)")
+    for stage in STAGES:
+        stage_stats = stats[stage]
+        print(f"  {stage:<28} {stage_stats['calls']:>7} calls {stage_stats['seconds']:>9.3f}s "
+              f"peak RSS +{stage_stats['rss_growth_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Stand-in for the `renderdoc` python module used by the import benchmarks.
+
+Only the parts of the API touched by rdc_importer are provided. Calling
+configure() generates a synthetic capture; the replay controller then serves
+vertex, index and texture data for it exactly like a real ReplayController
+would, so import_meshes_from_rdc can run end to end without Windows or a
+real .rdc file.
+"""
+import random
+import struct
+
+# Vertex layout used for every synthetic draw: POSITION, NORMAL, TEXCOORD
+POSITION_OFFSET = 0
+NORMAL_OFFSET = 12
+TEXCOORD_OFFSET = 24
+MIN_VERTEX_STRIDE = 32
+
+_capture = None
+
+
+class ReplayStatus:
+    Succeeded = 0
+    FileIOFailed = 1
+
+
+class FileType:
+    DDS = 0
+
+
+class AlphaMapping:
+    Preserve = 0
+
+
+class ShaderStage:
+    Vertex = 0
+    Fragment = 4
+    Pixel = 4
+
+
+class CompType:
+    Float = 1
+    UNorm = 2
+    SNorm = 3
+
+
+class Topology:
+    Unknown = 0
+    PointList = 1
+    LineList = 2
+    LineStrip = 3
+    LineLoop = 4
+    TriangleList = 5
+    TriangleStrip = 6
+    TriangleFan = 7
+    LineList_Adj = 8
+    LineStrip_Adj = 9
+    TriangleList_Adj = 10
+    TriangleStrip_Adj = 11
+
+
+class ResourceId:
+    def __init__(self, value=0):
+        self.value = value
+
+    @staticmethod
+    def Null():
+        return ResourceId(0)
+
+    def __eq__(self, other):
+        return isinstance(other, ResourceId) and self.value == other.value
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __str__(self):
+        return f"ResourceId::{self.value}"
+
+
+class _Struct:
+    """Plain attribute bag used for the pipeline state structures."""
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class TextureSave:
+    def __init__(self):
+        self.resourceId = ResourceId.Null()
+        self.destType = FileType.DDS
+        self.comp = _Struct(blackPoint=0.0, whitePoint=1.0)
+        self.alpha = AlphaMapping.Preserve
+        self.mip = 0
+        self.slice = _Struct(sliceIndex=0)
+
+
+class ReplayOptions:
+    pass
+
+
+def _resource_format(comp_type, comp_count, comp_byte_width=4):
+    return _Struct(compType=comp_type, compCount=comp_count, compByteWidth=comp_byte_width)
+
+
+def _dds_rgba8(width, height):
+    """Builds an uncompressed 32-bit RGBA DDS file of the given size."""
+    header = struct.pack(
+        '<4s7I44x8I5I',
+        b'DDS ', 124, 0x100F, height, width, width * 4, 0, 1,
+        32, 0x41, 0, 32, 0x00FF0000, 0x0000FF00, 0x000000FF, 0xFF000000,
+        0x1000, 0, 0, 0, 0,
+    )
+    return header + bytes(width * height * 4)
+
+
+def _grid_mesh(vertex_count, stride, seed, strips=False):
+    """
+    Returns interleaved vertex bytes and indices for a grid with roughly
+    `vertex_count` vertices. With `strips` the indices form one triangle strip
+    per row, separated by None where the restart index goes.
+    """
+    columns = max(2, int(vertex_count ** 0.5))
+    rows = max(2, vertex_count // columns)
+    rng = random.Random(seed)
+    offset_x, offset_y, offset_z = (rng.uniform(-50.0, 50.0) for _ in range(3))
+
+    padding = bytes(stride - MIN_VERTEX_STRIDE)
+    vertex_data = bytearray()
+    for row in range(rows):
+        for column in range(columns):
+            vertex_data += struct.pack(
+                '<8f',
+                offset_x + column * 0.1, offset_y + row * 0.1, offset_z,
+                0.0, 0.0, 1.0,
+                column / (columns - 1), row / (rows - 1),
+            )
+            vertex_data += padding
+
+    indices = []
+    if strips:
+        for row in range(rows - 1):
+            if row:
+                indices.append(None)
+            for column in range(columns):
+                indices.extend((row * columns + column, (row + 1) * columns + column))
+        return bytes(vertex_data), indices, rows * columns
+
+    for row in range(rows - 1):
+        for column in range(columns - 1):
+            a = row * columns + column
+            b = a + 1
+            c = a + columns
+            d = c + 1
+            indices.extend((a, c, b, b, c, d))
+
+    return bytes(vertex_data), indices, rows * columns
+
+
+class _SyntheticCapture:
+    def __init__(self, actions, vertices, stride, shared_buffer_ratio, textures_per_action,
+                 texture_pool, texture_size, strips, seed):
+        if stride < MIN_VERTEX_STRIDE:
+            raise ValueError(f"Vertex stride must be at least {MIN_VERTEX_STRIDE} bytes.")
+
+        rng = random.Random(seed)
+        self.buffers = {}
+        self.textures = []
+        self.texture_bytes = _dds_rgba8(texture_size, texture_size)
+        self.draws = {}
+        self.actions = []
+        self._next_id = 1000
+
+        for _ in range(texture_pool):
+            self.textures.append(_Struct(
+                resourceId=self._new_id(), width=texture_size, height=texture_size))
+
+        shared_draw = None
+        for index in range(actions):
+            event_id = (index + 1) * 10
+            if shared_draw is not None and rng.random() < shared_buffer_ratio:
+                vb_id, ib_id, index_count, index_stride = shared_draw
+            else:
+                vertex_data, indices, vertex_count = _grid_mesh(vertices, stride, seed + index, strips)
+                index_stride = 2 if vertex_count < 0xFFFF else 4
+                restart_index = 0xFFFF if index_stride == 2 else 0xFFFFFFFF
+                indices = [restart_index if i is None else i for i in indices]
+                index_data = struct.pack(f"<{len(indices)}{'H' if index_stride == 2 else 'I'}", *indices)
+                vb_id = self._new_id()
+                ib_id = self._new_id()
+                self.buffers[vb_id] = vertex_data
+                self.buffers[ib_id] = index_data
+                index_count = len(indices)
+                shared_draw = (vb_id, ib_id, index_count, index_stride)
+
+            bound = rng.sample(self.textures, min(textures_per_action, len(self.textures)))
+            self.draws[event_id] = _Struct(
+                topology=Topology.TriangleStrip if strips else Topology.TriangleList,
+                vertexBuffer=vb_id, indexBuffer=ib_id, indexByteStride=index_stride,
+                vertexByteStride=stride, textures=[tex.resourceId for tex in bound],
+            )
+            self.actions.append(_Struct(eventId=event_id, numIndices=index_count, children=[]))
+
+    def _new_id(self):
+        self._next_id += 1
+        return ResourceId(self._next_id)
+
+
+def configure(actions=100, vertices=2000, stride=MIN_VERTEX_STRIDE, shared_buffer_ratio=0.0,
+              textures_per_action=2, texture_pool=16, texture_size=4, strips=False, seed=1):
+    """
+    Generates the synthetic capture served by every subsequently opened
+    controller and returns it.
+    """
+    global _capture
+    _capture = _SyntheticCapture(actions, vertices, stride, shared_buffer_ratio,
+                                 textures_per_action, texture_pool, texture_size, strips, seed)
+    return _capture
+
+
+class _PipelineState:
+    def __init__(self, draw):
+        self._draw = draw
+
+    def GetPrimitiveTopology(self):
+        return self._draw.topology
+
+    def GetReadOnlyResources(self, stage):
+        if stage != ShaderStage.Fragment:
+            return []
+        return [_Struct(resources=[_Struct(resourceId=texture_id)]) for texture_id in self._draw.textures]
+
+    def GetShaderReflection(self, stage):
+        names = [f"txSlot{slot}" for slot in range(len(self._draw.textures))]
+        return _Struct(readOnlyResources=[_Struct(name=name) for name in names])
+
+
+class ReplayController:
+    def __init__(self, capture):
+        self._capture = capture
+        self._draw = None
+
+    def GetRootActions(self):
+        return self._capture.actions
+
+    def SetFrameEvent(self, event_id, force):
+        self._draw = self._capture.draws.get(event_id)
+
+    def GetPipelineState(self):
+        return _PipelineState(self._draw) if self._draw else None
+
+    def GetD3D11PipelineState(self):
+        draw = self._draw
+        layouts = [
+            _Struct(semanticName='POSITION', semanticIndex=0, inputSlot=0, byteOffset=POSITION_OFFSET,
+                    format=_resource_format(CompType.Float, 3)),
+            _Struct(semanticName='NORMAL', semanticIndex=0, inputSlot=0, byteOffset=NORMAL_OFFSET,
+                    format=_resource_format(CompType.Float, 3)),
+            _Struct(semanticName='TEXCOORD', semanticIndex=0, inputSlot=0, byteOffset=TEXCOORD_OFFSET,
+                    format=_resource_format(CompType.Float, 2)),
+        ]
+        input_assembly = _Struct(
+            indexBuffer=_Struct(resourceId=draw.indexBuffer, byteOffset=0, byteStride=draw.indexByteStride),
+            vertexBuffers=[_Struct(resourceId=draw.vertexBuffer, byteOffset=0, byteStride=draw.vertexByteStride)],
+            layouts=layouts,
+            topology=draw.topology,
+        )
+        return _Struct(inputAssembly=input_assembly)
+
+    def GetBufferData(self, resource_id, offset, length):
+        data = self._capture.buffers.get(resource_id, b'')
+        if length == 0:
+            return data[offset:]
+        return data[offset:offset + length]
+
+    def GetTextures(self):
+        return self._capture.textures
+
+    def SaveTexture(self, save_data, path):
+        with open(path, 'wb') as file:
+            file.write(self._capture.texture_bytes)
+        return True
+
+    def Shutdown(self):
+        pass
+
+
+class CaptureFile:
+    def OpenFile(self, path, filetype, progress):
+        return ReplayStatus.Succeeded if _capture is not None else ReplayStatus.FileIOFailed
+
+    def OpenCapture(self, options, progress):
+        return ReplayStatus.Succeeded, ReplayController(_capture)
+
+    def Shutdown(self):
+        pass
+
+
+def OpenCaptureFile():
+    return CaptureFile()
@@ -0,0 +1,402 @@
+import bpy
+import logging
+import math
+import os
+import struct
+import numpy as np
+from bpy_extras.io_utils import ImportHelper, axis_conversion
+from bpy.types import Operator
+from mathutils import Matrix
+
+# Set up logging
+logger = logging.getLogger("KN5Importer")
+
+# Reader for unencrypted Assetto Corsa kn5 files. The file holds a header, the
+# embedded textures, the materials and a tree of nodes: dummies carrying a
+# transform, static meshes and skinned meshes.
+KN5_MAGIC = b"sc6969"
+NODE_DUMMY = 1
+NODE_MESH = 2
+NODE_SKINNED_MESH = 3
+
+# Vertex layouts of the mesh nodes, 44 and 76 bytes per vertex
+MESH_VERTEX_DTYPE = np.dtype([
+    ("position", "<f4", 3),
+    ("normal", "<f4", 3),
+    ("uv", "<f4", 2),
+    ("tangent", "<f4", 3),
+])
+SKINNED_VERTEX_DTYPE = np.dtype([
+    ("position", "<f4", 3),
+    ("normal", "<f4", 3),
+    ("uv", "<f4", 2),
+    ("tangent", "<f4", 3),
+    ("weights", "<f4", 4),
+    ("bone_indices", "<f4", 4),
+])
+
+# Bytes after a mesh's material ID that the importer does not use: layer, LOD
+# distances, bounding sphere and renderable flag for static meshes, layer and
+# LOD distances for skinned meshes
+MESH_TRAILER_SIZE = 29
+SKINNED_MESH_TRAILER_SIZE = 12
+
+# Vectors stored after every material property value (vec2, vec3 and vec4)
+MATERIAL_PROPERTY_VECTORS_SIZE = 36
+
+# Sampler wired to the base color of the imported materials
+DIFFUSE_SAMPLER = "txDiffuse"
+
+
+class KN5Reader:
+    """
+    Sequential little endian reads from the bytes of a kn5 file.
+    """
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        values = struct.unpack_from(fmt, self.data, self.offset)
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def read_int(self):
+        return self.unpack("<i")[0]
+
+    def read_byte(self):
+        return self.unpack("<B")[0]
+
+    def read_float(self):
+        return self.unpack("<f")[0]
+
+    def read_bytes(self, size):
+        if size < 0 or self.offset + size > len(self.data):
+            raise ValueError(f"Unexpected end of kn5 data at offset {self.offset}.")
+        value = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return value
+
+    def read_string(self):
+        return bytes(self.read_bytes(self.read_int())).decode("utf-8", errors="replace")
+
+    def read_array(self, dtype, count):
+        array = np.frombuffer(self.data, dtype=dtype, count=count, offset=self.offset)
+        self.offset += array.nbytes
+        return array
+
+    def skip(self, size):
+        self.read_bytes(size)
+
+
+def read_textures(reader):
+    """
+    Returns the embedded textures as (name, data) tuples, the data being a
+    view into the file bytes.
+    """
+    textures = []
+    for _ in range(reader.read_int()):
+        reader.read_int()  # Active flag
+        name = reader.read_string()
+        textures.append((name, reader.read_bytes(reader.read_int())))
+    return textures
+
+
+def read_materials(reader, version):
+    """
+    Returns the materials as dictionaries with their name, shader, property
+    values by name and texture names by sampler name.
+    """
+    materials = []
+    for _ in range(reader.read_int()):
+        material = {"name": reader.read_string(), "shader": reader.read_string()}
+        material["blend_mode"] = reader.read_byte()
+        material["alpha_tested"] = bool(reader.read_byte())
+        material["depth_mode"] = reader.read_int() if version > 4 else 0
+
+        properties = {}
+        for _ in range(reader.read_int()):
+            property_name = reader.read_string()
+            properties[property_name] = reader.read_float()
+            reader.skip(MATERIAL_PROPERTY_VECTORS_SIZE)
+        material["properties"] = properties
+
+        samplers = {}
+        for _ in range(reader.read_int()):
+            sampler_name = reader.read_string()
+            reader.read_int()  # Slot
+            samplers[sampler_name] = reader.read_string()
+        material["samplers"] = samplers
+        materials.append(material)
+    return materials
+
+
+def read_node(reader):
+    """
+    Reads one node and all its children. Dummies get their local matrix in
+    Blender's column convention, meshes their vertex array, triangle indices
+    and material index.
+    """
+    node_class = reader.read_int()
+    node = {"class": node_class, "name": reader.read_string(), "matrix": None, "vertices": None}
+    child_count = reader.read_int()
+    node["active"] = bool(reader.read_byte())
+
+    if node_class == NODE_DUMMY:
+        # Stored row major for row vectors, so the translation is in the last row
+        node["matrix"] = reader.read_array("<f4", 16).reshape(4, 4).T.astype(np.float64)
+    elif node_class in (NODE_MESH, NODE_SKINNED_MESH):
+        reader.skip(3)  # Cast shadows, visible and transparent flags
+        if node_class == NODE_SKINNED_MESH:
+            for _ in range(reader.read_int()):
+                reader.read_string()  # Bone name
+                reader.skip(64)  # Bone matrix
+            vertex_dtype = SKINNED_VERTEX_DTYPE
+        else:
+            vertex_dtype = MESH_VERTEX_DTYPE
+        node["vertices"] = reader.read_array(vertex_dtype, reader.read_int())
+        node["indices"] = reader.read_array("<u2", reader.read_int())
+        node["material"] = reader.read_int()
+        reader.skip(SKINNED_MESH_TRAILER_SIZE if node_class == NODE_SKINNED_MESH else MESH_TRAILER_SIZE)
+    else:
+        raise ValueError(f"Unknown kn5 node class {node_class} for node '{node['name']}'.")
+
+    node["children"] = [read_node(reader) for _ in range(child_count)]
+    return node
+
+
+def parse_kn5(data):
+    """
+    Parses the bytes of an unencrypted kn5 file. Returns a dictionary with the
+    version, textures, materials and root node.
+    """
+    reader = KN5Reader(memoryview(data))
+    if bytes(reader.read_bytes(len(KN5_MAGIC))) != KN5_MAGIC:
+        raise ValueError("Not a kn5 file, or the file is encrypted.")
+
+    version = reader.read_int()
+    if version > 5:
+        reader.read_int()  # Unknown header value of newer versions
+
+    textures = read_textures(reader)
+    materials = read_materials(reader, version)
+    root = read_node(reader)
+    return {"version": version, "textures": textures, "materials": materials, "root": root}
+
+
+def save_textures(textures, texture_directory):
+    """
+    Writes the embedded textures to the texture directory, where the INI
+    processor looks for them. Existing files are kept, they may be textures
+    replaced by hand. Returns the number of files written.
+    """
+    os.makedirs(texture_directory, exist_ok=True)
+    written = 0
+    for name, data in textures:
+        texture_path = os.path.join(texture_directory, os.path.basename(name))
+        if os.path.exists(texture_path):
+            continue
+        with open(texture_path, "wb") as texture_file:
+            texture_file.write(data)
+        written += 1
+    logger.info(f"Wrote {written} of {len(textures)} textures to '{texture_directory}'.")
+    return written
+
+
+def load_texture_images(textures, texture_directory):
+    """
+    Loads the embedded textures from the texture directory. Returns a
+    dictionary mapping texture names to images, textures without a file on
+    disk are left out.
+    """
+    images = {}
+    for name, _ in textures:
+        texture_path = os.path.join(texture_directory, os.path.basename(name))
+        if not os.path.isfile(texture_path):
+            continue
+        try:
+            images[name] = bpy.data.images.load(texture_path, check_existing=True)
+        except RuntimeError as e:
+            logger.warning(f"Could not load texture '{texture_path}': {e}")
+    if len(images) < len(textures):
+        logger.warning(f"{len(textures) - len(images)} of {len(textures)} textures could not be loaded, their image nodes stay empty.")
+    return images
+
+
+def add_sampler_nodes(blender_material, samplers, images):
+    """
+    Adds an image texture node for each sampler of a kn5 material, labeled with
+    the sampler name, and wires the diffuse texture to the base color.
+    """
+    nodes = blender_material.node_tree.nodes
+    links = blender_material.node_tree.links
+    principled = next((node for node in nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    for slot, (sampler_name, texture_name) in enumerate(samplers.items()):
+        image_node = nodes.new('ShaderNodeTexImage')
+        image_node.label = sampler_name
+        image_node.location = (-600, 300 - slot * 300)
+        image_node.image = images.get(texture_name)
+        if sampler_name == DIFFUSE_SAMPLER and principled:
+            links.new(image_node.outputs['Color'], principled.inputs['Base Color'])
+
+
+def create_materials(materials, images):
+    """
+    Returns a Blender material for each kn5 material, named exactly as in the
+    kn5 so the INI processor finds them. New materials get an image texture
+    node per sampler. Existing materials are reused as they are.
+    """
+    blender_materials = []
+    for material in materials:
+        blender_material = bpy.data.materials.get(material["name"])
+        if blender_material is None:
+            blender_material = bpy.data.materials.new(material["name"])
+            blender_material.use_nodes = True
+            add_sampler_nodes(blender_material, material["samplers"], images)
+        blender_material["kn5_shader"] = material["shader"]
+        blender_materials.append(blender_material)
+    return blender_materials
+
+
+def create_mesh(name, vertices, indices):
+    """
+    Builds a mesh from a kn5 vertex array and triangle indices with bulk
+    foreach_set writes. Every kn5 vertex is kept so vertex counts match the
+    captured meshes. Triangles referencing missing vertices or repeating a
+    vertex are dropped, as the RDC importer does.
+    """
+    vertex_count = len(vertices)
+    triangles = np.asarray(indices[:len(indices) // 3 * 3], dtype=np.int32).reshape(-1, 3)
+    valid = (triangles < vertex_count).all(axis=1)
+    valid &= (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    triangles = triangles[valid]
+    if len(triangles) != len(indices) // 3:
+        logger.warning(f"Dropped {len(indices) // 3 - len(triangles)} invalid triangles from mesh '{name}'.")
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(vertex_count)
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(vertices["position"]).ravel())
+
+    loop_vertices = triangles.ravel()
+    mesh.loops.add(len(loop_vertices))
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.polygons.add(len(triangles))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, len(loop_vertices), 3, dtype=np.int32))
+    if bpy.app.version < (4, 0, 0):
+        # Polygon sizes became read only in Blender 4.0, they follow from the loop starts there
+        mesh.polygons.foreach_set("loop_total", np.full(len(triangles), 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    # kn5 UVs have V pointing down
+    uvs = np.array(vertices["uv"], dtype=np.float32)
+    uvs[:, 1] = 1 - uvs[:, 1]
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    uv_layer.data.foreach_set("uv", uvs[loop_vertices].ravel())
+
+    # Shade smooth with the stored normals as custom split normals
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(triangles), dtype=bool))
+    if hasattr(mesh, "use_auto_smooth"):
+        # Blender versions before 4.1 only evaluate custom normals with auto smooth enabled.
+        # A 180 degree angle keeps it from splitting any edges itself.
+        mesh.use_auto_smooth = True
+        mesh.auto_smooth_angle = math.pi
+    mesh.normals_split_custom_set_from_vertices(np.array(vertices["normal"], dtype=np.float32))
+    return mesh
+
+
+def import_kn5(filepath, export_textures=True):
+    """
+    Imports a kn5 file into the 'kn5' collection. Dummies become empties and
+    meshes become mesh objects parented to them, in the local coordinates of
+    the file. Only the top level nodes are converted from the kn5's Y up to
+    Blender's Z up, as the FBX importer does. Returns the number of meshes
+    created.
+    """
+    with open(filepath, "rb") as kn5_file:
+        kn5 = parse_kn5(kn5_file.read())
+    logger.info(f"Read kn5 version {kn5['version']} with {len(kn5['textures'])} textures and {len(kn5['materials'])} materials.")
+
+    texture_directory = os.path.join(os.path.dirname(filepath), "texture")
+    if export_textures and kn5["textures"]:
+        save_textures(kn5["textures"], texture_directory)
+    images = load_texture_images(kn5["textures"], texture_directory)
+
+    # Create the 'kn5' collection if it doesn't already exist
+    collection_name = "kn5"
+    if collection_name not in bpy.data.collections:
+        kn5_collection = bpy.data.collections.new(collection_name)
+        bpy.context.scene.collection.children.link(kn5_collection)
+    else:
+        kn5_collection = bpy.data.collections[collection_name]
+
+    materials = create_materials(kn5["materials"], images)
+    root_matrix = axis_conversion(from_forward='-Z', from_up='Y').to_4x4()
+
+    mesh_count = 0
+    stack = [(kn5["root"], None)]
+    while stack:
+        node, parent = stack.pop()
+        if node["vertices"] is None:
+            obj = bpy.data.objects.new(node["name"], None)
+            obj.matrix_basis = Matrix(node["matrix"].tolist())
+        else:
+            mesh = create_mesh(node["name"], node["vertices"], node["indices"])
+            if 0 <= node["material"] < len(materials):
+                mesh.materials.append(materials[node["material"]])
+            else:
+                logger.warning(f"Mesh '{node['name']}' uses missing material {node['material']}.")
+            obj = bpy.data.objects.new(node["name"], mesh)
+            mesh_count += 1
+
+        kn5_collection.objects.link(obj)
+        if parent is None:
+            obj.matrix_basis = root_matrix @ obj.matrix_basis
+        else:
+            obj.parent = parent
+        stack.extend((child, obj) for child in reversed(node["children"]))
+
+    logger.info(f"Imported {mesh_count} meshes from '{os.path.basename(filepath)}'.")
+    return mesh_count
+
+
+class ImportKN5Operator(Operator, ImportHelper):
+    """Operator to import an unencrypted kn5 file into a collection called 'kn5'"""
+    bl_idname = "import_scene.kn5"
+    bl_label = "Import KN5 into 'kn5' Collection"
+    bl_description = "Read an unencrypted kn5 file directly, without converting it to FBX first. The embedded textures are written to a 'texture' folder next to the file"
+    filename_ext = ".kn5"
+    filter_glob: bpy.props.StringProperty(default="*.kn5", options={'HIDDEN'})
+
+    export_textures: bpy.props.BoolProperty(
+        name="Export Textures",
+        description="Write the embedded textures to a 'texture' folder next to the kn5 file for the INI processor and the material image nodes. Existing files are kept. When disabled only textures already in the folder are loaded",
+        default=True
+    )
+
+    def execute(self, context):
+        kn5_file_path = self.filepath
+
+        # Check if the file exists
+        if not os.path.exists(kn5_file_path):
+            self.report({'ERROR'}, "File not found.")
+            return {'CANCELLED'}
+
+        if context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        try:
+            mesh_count = import_kn5(kn5_file_path, self.export_textures)
+        except (ValueError, struct.error) as e:
+            logger.error(f"Failed to read '{kn5_file_path}': {e}")
+            self.report({'ERROR'}, f"Could not read kn5 file: {e}")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"kn5 file '{os.path.basename(kn5_file_path)}' imported into 'kn5' collection ({mesh_count} meshes).")
+        return {'FINISHED'}
+
+# Register the operator
+def register():
+    bpy.utils.register_class(ImportKN5Operator)
+
+def unregister():
+    bpy.utils.unregister_class(ImportKN5Operator)
@@ -0,0 +1,115 @@
+import numpy as np
+
+# One-to-one assignment of candidate pairs for the mesh matcher. Only NumPy is
+# used here so the same code can run outside of Blender.
+
+
+def solve_assignment(cost):
+    """
+    Solves the min-cost assignment problem for a rectangular cost matrix where
+    np.inf marks pairs that may not be matched. The number of matched pairs is
+    maximised first and their total cost minimised second. Returns a list of
+    (row, column) pairs.
+    """
+    rows, columns = cost.shape
+    size = max(rows, columns)
+    allowed = np.isfinite(cost)
+    if not allowed.any():
+        return []
+
+    # Every allowed pair is worth more than any sum of real costs, so the solver
+    # never trades a matched pair for a cheaper total. Forbidden pairs and the
+    # padding of the square matrix cost nothing and count as unmatched.
+    bonus = np.abs(cost[allowed]).sum() + 1.0
+    square = np.zeros((size, size))
+    square[:rows, :columns] = np.where(allowed, cost - bonus, 0.0)
+
+    # Hungarian algorithm with potentials, row_of_column[j] is the row assigned to
+    # column j. Index 0 is the virtual start column, real rows and columns start at 1.
+    row_potential = np.zeros(size + 1)
+    column_potential = np.zeros(size + 1)
+    row_of_column = np.zeros(size + 1, dtype=np.int64)
+    previous_column = np.zeros(size + 1, dtype=np.int64)
+
+    for row in range(1, size + 1):
+        row_of_column[0] = row
+        column = 0
+        min_slack = np.full(size + 1, np.inf)
+        visited = np.zeros(size + 1, dtype=bool)
+
+        while True:
+            visited[column] = True
+            current_row = row_of_column[column]
+            free = ~visited[1:]
+
+            slack = square[current_row - 1] - row_potential[current_row] - column_potential[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            previous_column[1:][improved] = column
+
+            free_slack = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(free_slack)) + 1
+            delta = free_slack[next_column - 1]
+
+            visited_columns = np.nonzero(visited)[0]
+            row_potential[row_of_column[visited_columns]] += delta
+            column_potential[visited_columns] -= delta
+            min_slack[1:][free] -= delta
+
+            column = next_column
+            if row_of_column[column] == 0:
+                break
+
+        # Flip the augmenting path back to the start column
+        while column:
+            previous = previous_column[column]
+            row_of_column[column] = row_of_column[previous]
+            column = previous
+
+    pairs = []
+    for column in range(1, columns + 1):
+        row = row_of_column[column]
+        if 0 < row <= rows and allowed[row - 1, column - 1]:
+            pairs.append((int(row - 1), int(column - 1)))
+
+    return sorted(pairs)
+
+
+def assign_candidates(candidate_pairs):
+    """
+    Picks a globally optimal one-to-one set of matches from (kn5_index,
+    rdc_index, cost) candidate pairs. Candidates only link objects within the same
+    fingerprint bucket, so each connected group of candidates is solved on its own.
+    Returns the chosen (kn5_index, rdc_index, cost) pairs.
+    """
+    # Union-find over kn5 and RDC nodes to split the candidates into connected groups
+    parent = {}
+
+    def find(node):
+        while parent.setdefault(node, node) != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for kn5_index, rdc_index, _ in candidate_pairs:
+        parent[find(('kn5', kn5_index))] = find(('rdc', rdc_index))
+
+    groups = {}
+    for pair in candidate_pairs:
+        groups.setdefault(find(('kn5', pair[0])), []).append(pair)
+
+    assigned = []
+    for group in groups.values():
+        kn5_indices = sorted({pair[0] for pair in group})
+        rdc_indices = sorted({pair[1] for pair in group})
+        kn5_rows = {index: row for row, index in enumerate(kn5_indices)}
+        rdc_columns = {index: column for column, index in enumerate(rdc_indices)}
+
+        cost = np.full((len(kn5_indices), len(rdc_indices)), np.inf)
+        for kn5_index, rdc_index, pair_cost in group:
+            cost[kn5_rows[kn5_index], rdc_columns[rdc_index]] = pair_cost
+
+        for row, column in solve_assignment(cost):
+            assigned.append((kn5_indices[row], rdc_indices[column], float(cost[row, column])))
+
+    return sorted(assigned)
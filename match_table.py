@@ -0,0 +1,257 @@
+import bpy
+import logging
+
+# Set up logging
+logger = logging.getLogger("MatchTable")
+
+# Matches are kept in a table on the scene (Scene.rdac_matches) instead of as live
+# 'Copy Transforms' constraints, so large scenes do not evaluate thousands of
+# constraints on every redraw. Constraints are only added while previewing.
+PREVIEW_CONSTRAINT_NAME = "RDAC Match Preview"
+
+# Name of the constraints added by older versions of the matcher and the manual match
+LEGACY_CONSTRAINT_NAME = "Copy Transforms"
+
+# The meshes of the kn5 and RDC collections are sorted into child collections
+# named after the parent with these suffixes, so matched and unmatched sets can
+# be shown and hidden with one layer collection flag each.
+MATCHED_SUFFIX = "_Matched"
+UNMATCHED_SUFFIX = "_Unmatched"
+
+
+class RDAC_MatchItem(bpy.types.PropertyGroup):
+    rdc_object: bpy.props.PointerProperty(
+        name="RDC Object",
+        description="Imported RenderDoc object that takes the place of the kn5 object",
+        type=bpy.types.Object
+    )
+    kn5_object: bpy.props.PointerProperty(
+        name="KN5 Object",
+        description="kn5 object whose transform, name and material the RDC object takes over",
+        type=bpy.types.Object
+    )
+    distance: bpy.props.FloatProperty(
+        name="Distance",
+        description="Distance between the mesh centers",
+        default=0.0
+    )
+    score: bpy.props.FloatProperty(
+        name="Score",
+        description="Rigid fit residual of the pair, or -1 when the match was not verified",
+        default=-1.0
+    )
+    overlap: bpy.props.FloatProperty(
+        name="Overlap",
+        description="Fraction of the RDC mesh's vertices overlapping the kn5 mesh, or -1 when the pair was not found by overlap matching",
+        default=-1.0
+    )
+
+
+def is_plain_copy_transforms(constraint):
+    """
+    Returns True if a 'Copy Transforms' constraint has default settings, so its
+    result is exactly the target's world matrix.
+    """
+    return (
+        not constraint.mute
+        and constraint.influence == 1.0
+        and constraint.mix_mode == 'REPLACE'
+        and constraint.owner_space == 'WORLD'
+        and constraint.target_space == 'WORLD'
+        and not constraint.subtarget
+    )
+
+
+def get_valid_matches(scene):
+    """
+    Returns the (rdc_object, kn5_object, item) entries of the match table whose
+    objects both still exist.
+    """
+    return [(item.rdc_object, item.kn5_object, item) for item in scene.rdac_matches if item.rdc_object and item.kn5_object]
+
+
+def add_match(scene, rdc_object, kn5_object, distance=0.0, score=-1.0, overlap=-1.0, exclusive=True):
+    """
+    Adds a pair to the match table. Entries that already use either object are
+    replaced, so every object stays in at most one pair. Without exclusive only
+    the RDC object's entry is replaced, so several RDC objects can share a kn5 object.
+    """
+    add_matches(scene, [(rdc_object, kn5_object, distance, score, overlap)], exclusive)
+
+
+def add_matches(scene, matches, exclusive=True):
+    """
+    Adds several (rdc_object, kn5_object, distance, score, overlap) pairs to the
+    match table like add_match, scanning the existing entries only once.
+    """
+    rdc_objects = {match[0] for match in matches}
+    kn5_objects = {match[1] for match in matches} if exclusive else set()
+    remove_matches(scene, lambda item: item.rdc_object in rdc_objects or item.kn5_object in kn5_objects)
+
+    for rdc_object, kn5_object, distance, score, overlap in matches:
+        item = scene.rdac_matches.add()
+        item.rdc_object = rdc_object
+        item.kn5_object = kn5_object
+        item.distance = distance
+        item.score = score
+        item.overlap = overlap
+
+
+def remove_matches(scene, predicate):
+    """
+    Removes the entries of the match table for which predicate(item) is True.
+    """
+    for index in reversed(range(len(scene.rdac_matches))):
+        if predicate(scene.rdac_matches[index]):
+            scene.rdac_matches.remove(index)
+
+
+def migrate_constraint_matches(scene, collection):
+    """
+    Moves pairs stored as plain 'Copy Transforms' constraints on the objects of
+    the collection, as written by older versions, into the match table and
+    removes the constraints. Constraints with other settings are left in place.
+    """
+    pairs = []
+    for obj in collection.all_objects:
+        for constraint in list(obj.constraints):
+            if constraint.type != 'COPY_TRANSFORMS' or not constraint.name.startswith(LEGACY_CONSTRAINT_NAME):
+                continue
+            if constraint.target and is_plain_copy_transforms(constraint):
+                pairs.append((obj, constraint.target))
+                obj.constraints.remove(constraint)
+
+    # Later constraints win over earlier ones sharing an object, as one
+    # add_match call per constraint would leave it
+    matches = []
+    seen_rdc, seen_kn5 = set(), set()
+    for rdc_object, kn5_object in reversed(pairs):
+        if rdc_object not in seen_rdc and kn5_object not in seen_kn5:
+            matches.append((rdc_object, kn5_object, 0.0, -1.0, -1.0))
+        seen_rdc.add(rdc_object)
+        seen_kn5.add(kn5_object)
+    add_matches(scene, matches[::-1])
+
+    migrated = len(pairs)
+    if migrated:
+        logger.info(f"Moved {migrated} 'Copy Transforms' constraints into the match table.")
+    return migrated
+
+
+def get_child_collection(parent, name):
+    """
+    Returns the collection with the given name, creating it and linking it under
+    the parent collection if needed.
+    """
+    collection = bpy.data.collections.get(name)
+    if not collection:
+        collection = bpy.data.collections.new(name)
+    if name not in parent.children:
+        parent.children.link(collection)
+    return collection
+
+
+def sort_into_match_collections(parent, matched_objects):
+    """
+    Moves every mesh linked directly to the parent collection or to one of its
+    matched and unmatched child collections into the matched or unmatched one,
+    depending on whether it is in matched_objects. Meshes in other child
+    collections are left where the user put them.
+    """
+    matched_collection = get_child_collection(parent, parent.name + MATCHED_SUFFIX)
+    unmatched_collection = get_child_collection(parent, parent.name + UNMATCHED_SUFFIX)
+
+    moved = 0
+    candidates = dict.fromkeys([*parent.objects, *matched_collection.objects, *unmatched_collection.objects])
+    for obj in candidates:
+        if obj.type != 'MESH':
+            continue
+
+        target, other = (matched_collection, unmatched_collection) if obj in matched_objects else (unmatched_collection, matched_collection)
+        # Name lookups in collection.objects are linear, ask the object instead
+        users = obj.users_collection
+        if target in users:
+            continue
+
+        target.objects.link(obj)
+        for collection in (parent, other):
+            if collection in users:
+                collection.objects.unlink(obj)
+        moved += 1
+
+    return moved
+
+
+def update_match_collections(scene):
+    """
+    Sorts the kn5 and RDC meshes into their matched and unmatched child
+    collections according to the match table.
+    """
+    matches = get_valid_matches(scene)
+    moved = 0
+
+    kn5_collection = bpy.data.collections.get('kn5')
+    if kn5_collection:
+        moved += sort_into_match_collections(kn5_collection, {kn5_object for _, kn5_object, _ in matches})
+
+    rdc_collection = bpy.data.collections.get('RDC')
+    if rdc_collection:
+        moved += sort_into_match_collections(rdc_collection, {rdc_object for rdc_object, _, _ in matches})
+
+    logger.info(f"Sorted {moved} objects into the matched and unmatched collections.")
+
+
+def find_layer_collection(layer_collection, name):
+    """
+    Returns the layer collection of the named collection below the given one, or None.
+    """
+    if layer_collection.name == name:
+        return layer_collection
+    for child in layer_collection.children:
+        found = find_layer_collection(child, name)
+        if found:
+            return found
+    return None
+
+
+def set_match_collections_hidden(view_layer, hidden, suffix=MATCHED_SUFFIX):
+    """
+    Shows or hides the kn5 and RDC child collections with the given suffix in
+    the view layer. Returns the number of collections changed.
+    """
+    changed = 0
+    for parent_name in ('kn5', 'RDC'):
+        layer_collection = find_layer_collection(view_layer.layer_collection, parent_name + suffix)
+        if layer_collection:
+            layer_collection.hide_viewport = hidden
+            changed += 1
+    return changed
+
+
+def clear_match_preview(scene):
+    """
+    Removes the preview constraints from every object.
+    """
+    for obj in scene.objects:
+        constraint = obj.constraints.get(PREVIEW_CONSTRAINT_NAME)
+        if constraint:
+            obj.constraints.remove(constraint)
+
+
+def refresh_match_preview(scene):
+    """
+    Rebuilds the preview constraints from the match table while previewing is
+    enabled, so every RDC object is shown on top of its kn5 partner.
+    """
+    clear_match_preview(scene)
+    if not scene.preview_matches:
+        return
+
+    for rdc_object, kn5_object, _ in get_valid_matches(scene):
+        constraint = rdc_object.constraints.new(type='COPY_TRANSFORMS')
+        constraint.name = PREVIEW_CONSTRAINT_NAME
+        constraint.target = kn5_object
+
+
+def update_match_preview(self, context):
+    refresh_match_preview(context.scene)
@@ -0,0 +1,120 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+# Worker side of the process pool used by the mesh matcher. Nothing in here may
+# import bpy: the functions run in plain Python processes started by the
+# matcher, which import this file as a top level module.
+try:
+    from .mesh_fingerprints import compute_fingerprint, rigid_fit_residual
+except ImportError:
+    from mesh_fingerprints import compute_fingerprint, rigid_fit_residual
+
+
+class SharedMeshArrays:
+    """
+    Vertex coordinates and edges of many meshes packed into one shared memory
+    block. The block starts with the vertex and edge offset tables (int64,
+    object count + 1 entries each), followed by all coordinates (float32, 3 per
+    vertex) and all edge vertex indices (int32, 2 per edge).
+    """
+    def __init__(self, block, object_count, vertex_total, edge_total):
+        self.block = block
+        self.object_count = object_count
+        self.vertex_total = vertex_total
+        self.edge_total = edge_total
+
+        offsets_size = (object_count + 1) * 8
+        coords_start = offsets_size * 2
+        edges_start = coords_start + vertex_total * 12
+        buffer = block.buf
+        self.vertex_offsets = np.ndarray(object_count + 1, dtype=np.int64, buffer=buffer)
+        self.edge_offsets = np.ndarray(object_count + 1, dtype=np.int64, buffer=buffer, offset=offsets_size)
+        self.coords = np.ndarray(vertex_total * 3, dtype=np.float32, buffer=buffer, offset=coords_start)
+        self.edges = np.ndarray(edge_total * 2, dtype=np.int32, buffer=buffer, offset=edges_start)
+
+    @classmethod
+    def create(cls, vertex_counts, edge_counts):
+        """
+        Allocates a new block sized for meshes with the given vertex and edge
+        counts and fills in the offset tables. Coordinates and edges are left
+        for the caller to write.
+        """
+        object_count = len(vertex_counts)
+        vertex_offsets = np.concatenate([[0], np.cumsum(vertex_counts, dtype=np.int64)])
+        edge_offsets = np.concatenate([[0], np.cumsum(edge_counts, dtype=np.int64)])
+        vertex_total = int(vertex_offsets[-1])
+        edge_total = int(edge_offsets[-1])
+
+        size = (object_count + 1) * 16 + vertex_total * 12 + edge_total * 8
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(block, object_count, vertex_total, edge_total)
+        shared.vertex_offsets[:] = vertex_offsets
+        shared.edge_offsets[:] = edge_offsets
+        return shared
+
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Opens a block created in another process from its descriptor.
+        """
+        name, object_count, vertex_total, edge_total = descriptor
+        return cls(shared_memory.SharedMemory(name=name), object_count, vertex_total, edge_total)
+
+    @property
+    def descriptor(self):
+        return (self.block.name, self.object_count, self.vertex_total, self.edge_total)
+
+    def coords_of(self, index):
+        """
+        Returns the flat coordinate slice of one mesh, 3 floats per vertex.
+        """
+        return self.coords[self.vertex_offsets[index] * 3:self.vertex_offsets[index + 1] * 3]
+
+    def edges_of(self, index):
+        """
+        Returns the flat edge slice of one mesh, 2 vertex indices per edge.
+        """
+        return self.edges[self.edge_offsets[index] * 2:self.edge_offsets[index + 1] * 2]
+
+    def release(self, unlink=False):
+        # Views into the buffer must be dropped before the block can close
+        self.vertex_offsets = self.edge_offsets = self.coords = self.edges = None
+        self.block.close()
+        if unlink:
+            self.block.unlink()
+
+
+def fingerprint_chunk(descriptor, indices, triangle_counts):
+    """
+    Computes the fingerprints of the meshes at the given indices of a shared block.
+    The block is closed again before returning: workers outlive the stage that
+    created it, and an open attachment keeps its memory from being freed.
+    """
+    shared = SharedMeshArrays.attach(descriptor)
+    try:
+        return [
+            compute_fingerprint(shared.coords_of(index).reshape(-1, 3), shared.edges_of(index).reshape(-1, 2), triangle_count)
+            for index, triangle_count in zip(indices, triangle_counts)
+        ]
+    finally:
+        shared.release()
+
+
+def residual_chunk(source_descriptor, target_descriptor, pairs):
+    """
+    Returns the rigid fit residual of each (source_index, target_index) pair,
+    fitting the source points onto the corresponding target points. The blocks
+    hold the vertex subsamples already cut by the matcher.
+    """
+    sources = SharedMeshArrays.attach(source_descriptor)
+    try:
+        targets = SharedMeshArrays.attach(target_descriptor)
+        try:
+            return [
+                rigid_fit_residual(sources.coords_of(source_index).reshape(-1, 3), targets.coords_of(target_index).reshape(-1, 3))
+                for source_index, target_index in pairs
+            ]
+        finally:
+            targets.release()
+    finally:
+        sources.release()
@@ -0,0 +1,263 @@
+import numpy as np
+from collections import Counter
+
+# Geometric fingerprints used by the mesh matcher to prune candidate pairs.
+# Only NumPy is used here so the same code can run outside of Blender.
+
+# Relative tolerances when comparing bounding box extents and PCA eigenvalues.
+# Both are measured against the largest value of the kn5 mesh.
+EXTENT_TOLERANCE = 1e-3
+EIGENVALUE_TOLERANCE = 1e-3
+ABSOLUTE_TOLERANCE = 1e-5
+
+# Edge lengths are binned by their power of two within this range
+EDGE_HISTOGRAM_MIN_EXPONENT = -16
+EDGE_HISTOGRAM_MAX_EXPONENT = 16
+EDGE_HISTOGRAM_BINS = EDGE_HISTOGRAM_MAX_EXPONENT - EDGE_HISTOGRAM_MIN_EXPONENT + 1
+
+# Edges close to a power of two can change bin with vertex noise or float
+# rounding, so histograms agree while their L1 distance stays below this
+# fraction of the edge count
+EDGE_HISTOGRAM_TOLERANCE = 0.2
+
+# Rigid verification accepts a pair while the RMS residual stays below this
+# fraction of the bounding box diagonal
+VERIFY_MAX_RESIDUAL_RATIO = 1e-2
+
+# Vertex sample counts of the level of detail pyramid, coarsest first. Pairs are
+# only fitted at a finer level while a coarser one leaves them ambiguous, that
+# is with a residual within LOD_MARGIN of the limit or competing with another pair.
+LOD_SAMPLE_COUNTS = (64, 1024, 16384)
+LOD_MARGIN = 4.0
+
+# Automatic thresholds look for a gap of at least AUTO_THRESHOLD_MIN_GAP decades
+# between the nearest candidate distances. Distances below the minimum count as
+# equal, and pairs closer than the floor (1 mm) are always kept.
+AUTO_THRESHOLD_MIN_DISTANCE = 1e-7
+AUTO_THRESHOLD_MIN_GAP = 1.0
+AUTO_THRESHOLD_FLOOR = 1e-3
+
+
+def edge_length_histogram(coords, edge_vertices):
+    """
+    Returns the histogram of edge lengths, binned by power of two.
+    """
+    if not len(edge_vertices):
+        return np.zeros(EDGE_HISTOGRAM_BINS, dtype=np.int64)
+
+    lengths = np.linalg.norm(coords[edge_vertices[:, 0]] - coords[edge_vertices[:, 1]], axis=1)
+    exponents = np.floor(np.log2(np.maximum(lengths, 2.0 ** EDGE_HISTOGRAM_MIN_EXPONENT)))
+    exponents = np.clip(exponents, EDGE_HISTOGRAM_MIN_EXPONENT, EDGE_HISTOGRAM_MAX_EXPONENT).astype(np.int64)
+    return np.bincount(exponents - EDGE_HISTOGRAM_MIN_EXPONENT, minlength=EDGE_HISTOGRAM_BINS).astype(np.int64)
+
+
+def compute_fingerprint(coords, edge_vertices, triangle_count):
+    """
+    Computes the fingerprint of one mesh from its (N, 3) vertex coordinates,
+    (E, 2) edge vertex indices and triangle count. The fingerprint holds the
+    vertex and triangle counts, the center, the axis aligned bounding box
+    extents, the sorted eigenvalues of the vertex covariance and the edge
+    length histogram.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    fingerprint = {
+        "vertex_count": len(coords),
+        "triangle_count": int(triangle_count),
+        "center": np.zeros(3),
+        "extents": np.zeros(3),
+        "eigenvalues": np.zeros(3),
+        "edge_histogram": np.zeros(EDGE_HISTOGRAM_BINS, dtype=np.int64),
+    }
+    if not len(coords):
+        return fingerprint
+
+    center = coords.mean(axis=0)
+    centered = coords - center
+    fingerprint["center"] = center
+    fingerprint["extents"] = coords.max(axis=0) - coords.min(axis=0)
+    # Second moments of the vertex cloud, sorted largest first
+    fingerprint["eigenvalues"] = np.linalg.eigvalsh(centered.T @ centered / len(coords))[::-1]
+    fingerprint["edge_histogram"] = edge_length_histogram(coords, np.asarray(edge_vertices).reshape(-1, 2))
+
+    return fingerprint
+
+
+def subsample_indices(vertex_count, sample_count=LOD_SAMPLE_COUNTS[-1]):
+    """
+    Returns up to sample_count vertex indices, a stratified sample with one index
+    from each equal slice of the index range. The offsets inside the slices are
+    seeded by the vertex count, so the same vertex count always gives the same
+    indices and both meshes of a pair are sampled at corresponding vertices.
+    """
+    if vertex_count <= sample_count:
+        return np.arange(vertex_count, dtype=np.int64)
+
+    bounds = np.arange(sample_count + 1, dtype=np.int64) * vertex_count // sample_count
+    offsets = np.random.default_rng(vertex_count).random(sample_count)
+    return bounds[:-1] + (offsets * np.diff(bounds)).astype(np.int64)
+
+
+def rigid_fit_residual(source, target):
+    """
+    Fits the best rotation and translation mapping the source points onto the
+    corresponding target points (Kabsch) and returns the RMS residual. Reflections
+    are not allowed, so mirrored parts do not fit each other.
+    """
+    source = np.asarray(source, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    if not len(source):
+        return 0.0
+
+    source_centered = source - source.mean(axis=0)
+    target_centered = target - target.mean(axis=0)
+
+    u, _, vt = np.linalg.svd(source_centered.T @ target_centered)
+    # Flip the smallest axis when the best orthogonal fit would be a reflection
+    correction = np.diag([1.0, 1.0, np.sign(np.linalg.det(u @ vt)) or 1.0])
+    rotation = u @ correction @ vt
+
+    residual = source_centered @ rotation - target_centered
+    return float(np.sqrt((residual ** 2).sum(axis=1).mean()))
+
+
+def residual_limit(extents):
+    """
+    Returns the largest RMS residual accepted for a mesh with the given extents.
+    """
+    return VERIFY_MAX_RESIDUAL_RATIO * float(np.linalg.norm(extents)) + ABSOLUTE_TOLERANCE
+
+
+def split_lod_candidates(pairs, residuals, limits, final):
+    """
+    Sorts candidate (kn5_index, rdc_index) pairs fitted at one level of detail.
+    Pairs whose residual is more than LOD_MARGIN times their limit are dropped.
+    A pair is accepted once its residual is LOD_MARGIN times below the limit and
+    no other remaining pair shares either of its objects. Pairs marked final
+    were fitted on all their vertices and are decided against the limit alone.
+    Returns the accepted pairs with their residuals and the still ambiguous pairs.
+    """
+    residuals = np.asarray(residuals, dtype=np.float64)
+    limits = np.asarray(limits, dtype=np.float64)
+    surviving = np.where(final, residuals <= limits, residuals <= limits * LOD_MARGIN)
+
+    kn5_counts = Counter(pair[0] for pair, keep in zip(pairs, surviving) if keep)
+    rdc_counts = Counter(pair[1] for pair, keep in zip(pairs, surviving) if keep)
+
+    accepted = {}
+    ambiguous = []
+    for pair, residual, limit, keep, is_final in zip(pairs, residuals, limits, surviving, final):
+        if not keep:
+            continue
+        if is_final or (residual <= limit / LOD_MARGIN and kn5_counts[pair[0]] == 1 and rdc_counts[pair[1]] == 1):
+            accepted[pair] = float(residual)
+        else:
+            ambiguous.append(pair)
+    return accepted, ambiguous
+
+
+def pick_threshold(nearest_distances):
+    """
+    Picks a matching threshold from the distances between every object and its
+    nearest candidate. Correct pairs sit close to zero and spurious ones much
+    further away, so the threshold goes to the geometric middle of the widest
+    gap between the sorted distances. Returns None when no gap is at least
+    AUTO_THRESHOLD_MIN_GAP decades wide, otherwise at least AUTO_THRESHOLD_FLOOR.
+    """
+    logs = np.sort(np.log10(np.maximum(np.asarray(nearest_distances, dtype=np.float64), AUTO_THRESHOLD_MIN_DISTANCE)))
+    if len(logs) < 2:
+        return None
+
+    gaps = np.diff(logs)
+    # Widest gap, the highest one on ties
+    widest = len(gaps) - 1 - int(np.argmax(gaps[::-1]))
+    if gaps[widest] < AUTO_THRESHOLD_MIN_GAP:
+        return None
+    return max(float(10.0 ** ((logs[widest] + logs[widest + 1]) / 2.0)), AUTO_THRESHOLD_FLOOR)
+
+
+def distance_histogram(distances):
+    """
+    Counts the distances per power of ten. Returns a list of (low, high, count)
+    bins covering all distances, zero distances going into the lowest bin.
+    """
+    logs = np.log10(np.maximum(np.asarray(distances, dtype=np.float64), AUTO_THRESHOLD_MIN_DISTANCE))
+    if not len(logs):
+        return []
+
+    edges = np.arange(np.floor(logs.min()), np.floor(logs.max()) + 2)
+    counts, _ = np.histogram(logs, bins=edges)
+    return [(float(10.0 ** low), float(10.0 ** high), int(count)) for low, high, count in zip(edges[:-1], edges[1:], counts)]
+
+
+def fingerprint_to_dict(fingerprint):
+    """
+    Converts a fingerprint to plain Python values that can be stored as a
+    Blender custom property.
+    """
+    return {
+        "vertex_count": int(fingerprint["vertex_count"]),
+        "triangle_count": int(fingerprint["triangle_count"]),
+        "center": [float(value) for value in fingerprint["center"]],
+        "extents": [float(value) for value in fingerprint["extents"]],
+        "eigenvalues": [float(value) for value in fingerprint["eigenvalues"]],
+        "edge_histogram": [int(value) for value in fingerprint["edge_histogram"]],
+    }
+
+
+def fingerprint_from_dict(values):
+    """
+    Rebuilds a fingerprint from the values written by fingerprint_to_dict.
+    """
+    return {
+        "vertex_count": int(values["vertex_count"]),
+        "triangle_count": int(values["triangle_count"]),
+        "center": np.array(values["center"], dtype=np.float64),
+        "extents": np.array(values["extents"], dtype=np.float64),
+        "eigenvalues": np.array(values["eigenvalues"], dtype=np.float64),
+        "edge_histogram": np.array(values["edge_histogram"], dtype=np.int64),
+    }
+
+
+def stack_fingerprints(fingerprints):
+    """
+    Packs a list of fingerprints into a table of parallel NumPy arrays.
+    """
+    count = len(fingerprints)
+    return {
+        "counts": np.array([f["vertex_count"] for f in fingerprints], dtype=np.int64).reshape(count),
+        "triangle_counts": np.array([f["triangle_count"] for f in fingerprints], dtype=np.int64).reshape(count),
+        "centers": np.array([f["center"] for f in fingerprints], dtype=np.float64).reshape(count, 3),
+        "extents": np.array([f["extents"] for f in fingerprints], dtype=np.float64).reshape(count, 3),
+        "eigenvalues": np.array([f["eigenvalues"] for f in fingerprints], dtype=np.float64).reshape(count, 3),
+        "edge_histograms": np.array([f["edge_histogram"] for f in fingerprints], dtype=np.int64).reshape(count, EDGE_HISTOGRAM_BINS),
+    }
+
+
+def bucket_key(table, index):
+    """
+    Returns the exact-match part of a fingerprint: vertex count and triangle
+    count. Objects can only match inside the same bucket.
+    """
+    return (int(table["counts"][index]), int(table["triangle_counts"][index]))
+
+
+def shape_compatible(table, index, other_table, other_indices):
+    """
+    Compares one fingerprint against several others, cheapest check first.
+    Returns a boolean mask over other_indices of the shapes that agree.
+    """
+    other_indices = np.asarray(other_indices, dtype=np.int64)
+
+    extents = table["extents"][index]
+    extent_limit = EXTENT_TOLERANCE * extents.max() + ABSOLUTE_TOLERANCE
+    mask = (np.abs(other_table["extents"][other_indices] - extents) <= extent_limit).all(axis=1)
+
+    eigenvalues = table["eigenvalues"][index]
+    eigenvalue_limit = EIGENVALUE_TOLERANCE * eigenvalues.max() + ABSOLUTE_TOLERANCE
+    mask[mask] = (np.abs(other_table["eigenvalues"][other_indices[mask]] - eigenvalues) <= eigenvalue_limit).all(axis=1)
+
+    histogram = table["edge_histograms"][index]
+    histogram_limit = EDGE_HISTOGRAM_TOLERANCE * histogram.sum()
+    mask[mask] = np.abs(other_table["edge_histograms"][other_indices[mask]] - histogram).sum(axis=1) <= histogram_limit
+
+    return mask
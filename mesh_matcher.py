@@ -1,30 +1,471 @@
 import bpy
+import hashlib
 import logging
-import mathutils
+import multiprocessing
+import numpy as np
+import os
+import sys
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from mathutils.kdtree import KDTree
+from .mesh_fingerprints import compute_fingerprint, stack_fingerprints, bucket_key, shape_compatible, fingerprint_to_dict, fingerprint_from_dict
+from .mesh_fingerprints import LOD_SAMPLE_COUNTS, subsample_indices, rigid_fit_residual, residual_limit, split_lod_candidates
+from .mesh_fingerprints import pick_threshold, distance_histogram
+from .object_utils import object_exists, remove_objects
+from .name_registry import NameRegistry
+from .match_assignment import assign_candidates
+from .voxel_overlap import build_voxel_table, score_overlaps, assign_overlaps
+from .texture_signatures import TEXTURE_TIE_BREAK, TextureSignatureCache, textures_compatible, texture_similarity
+from .match_table import PREVIEW_CONSTRAINT_NAME, MATCHED_SUFFIX, UNMATCHED_SUFFIX, get_valid_matches, add_match, add_matches, remove_matches
+from .match_table import migrate_constraint_matches, refresh_match_preview, update_match_collections, set_match_collections_hidden
 
 # Set up logging
 logger = logging.getLogger("MeshMatcher")
 
-def get_vertex_count_and_center(obj):
+# Fingerprints are cached as a custom property on each mesh datablock.
+# Bump the version whenever the fingerprint contents change.
+FINGERPRINT_PROPERTY = "rdac_fingerprint"
+FINGERPRINT_VERSION = 2
+FINGERPRINT_CHECKSUM_SAMPLES = 64
+
+# Fingerprinting and verification only move to worker processes once there is
+# enough work to pay for starting them
+POOL_MIN_OBJECTS = 500
+POOL_MIN_PAIRS = 2000
+POOL_TASKS_PER_WORKER = 4
+
+# The matching steps hand control back after every chunk of this many objects,
+# and the modal operator runs steps for at most MATCH_TICK_SECONDS per timer tick
+MATCH_CHUNK_SIZE = 64
+MATCH_TICK_SECONDS = 0.1
+
+# With an automatic threshold every kn5 object looks at this many of its
+# nearest candidates instead of all candidates within the threshold
+AUTO_THRESHOLD_NEIGHBOURS = 8
+
+# Level of detail samples of the meshes used for verification, by mesh, geometry
+# checksum and sample count. Only kept in memory for one matching run, the least
+# recently used levels are evicted once it holds more than LOD_CACHE_MAX_POINTS points.
+LOD_CACHE = OrderedDict()
+LOD_CACHE_MAX_POINTS = 16 * 1024 * 1024
+_lod_cache_points = 0
+
+def get_vertex_positions(obj):
     """
-    Returns the vertex count and the approximate center of vertices.
+    Returns the local vertex coordinates of a mesh object as an (N, 3) float32 array.
     """
-    vertices = [v.co for v in obj.data.vertices]
-    vertex_count = len(vertices)
-    
-    # Calculate approximate center by averaging vertex positions
-    avg_x = sum(v.x for v in vertices) / vertex_count
-    avg_y = sum(v.y for v in vertices) / vertex_count
-    avg_z = sum(v.z for v in vertices) / vertex_count
-    center = mathutils.Vector((avg_x, avg_y, avg_z))
-    
-    return vertex_count, center
+    vertices = obj.data.vertices
+    coords = np.empty(len(vertices) * 3, dtype=np.float32)
+    vertices.foreach_get("co", coords)
+    return coords.reshape(-1, 3)
+
+def get_triangle_count(mesh):
+    """
+    Returns the number of triangles the polygons of a mesh split into.
+    """
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return int((loop_totals - 2).sum())
+
+def get_mesh_topology(obj):
+    """
+    Returns the (E, 2) edge vertex indices and the triangle count of a mesh object.
+    """
+    mesh = obj.data
+    edge_vertices = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edge_vertices)
+    return edge_vertices.reshape(-1, 2), get_triangle_count(mesh)
+
+def get_object_fingerprint(obj):
+    """
+    Computes the geometric fingerprint of a mesh object, see mesh_fingerprints.
+    """
+    edge_vertices, triangle_count = get_mesh_topology(obj)
+    return compute_fingerprint(get_vertex_positions(obj), edge_vertices, triangle_count)
+
+def get_geometry_checksum(mesh):
+    """
+    Returns a cheap content checksum of a mesh: its element counts plus a hash
+    of a fixed sample of vertex coordinates.
+    """
+    vertex_count = len(mesh.vertices)
+    samples = np.unique(np.linspace(0, vertex_count - 1, min(vertex_count, FINGERPRINT_CHECKSUM_SAMPLES)).astype(np.int64))
+    # One bulk read is much cheaper than a Python level lookup per sampled vertex
+    all_coords = np.empty(vertex_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", all_coords)
+    coords = np.ascontiguousarray(all_coords.reshape(-1, 3)[samples])
+    digest = hashlib.blake2b(coords.tobytes(), digest_size=8).hexdigest()
+    return f"{vertex_count}:{len(mesh.edges)}:{len(mesh.polygons)}:{digest}"
+
+def read_cached_fingerprint(mesh, checksum):
+    """
+    Returns the fingerprint stored on a mesh datablock if it was computed for
+    geometry with the same checksum, otherwise None.
+    """
+    cached = mesh.get(FINGERPRINT_PROPERTY)
+    if cached and cached.get("version") == FINGERPRINT_VERSION and cached.get("checksum") == checksum:
+        return fingerprint_from_dict(cached)
+    return None
+
+def store_cached_fingerprint(mesh, fingerprint, checksum):
+    """
+    Stores a fingerprint on a mesh datablock. The cache is saved with the .blend
+    file, so it survives across sessions.
+    """
+    mesh[FINGERPRINT_PROPERTY] = dict(fingerprint_to_dict(fingerprint), version=FINGERPRINT_VERSION, checksum=checksum)
+
+def load_match_workers():
+    """
+    Imports match_workers as a top level module. Worker processes cannot import
+    bpy or this add-on package, so they need to find the module's functions
+    under a plain module name.
+    """
+    addon_dir = os.path.dirname(os.path.abspath(__file__))
+    if addon_dir not in sys.path:
+        sys.path.append(addon_dir)
+    import match_workers
+    return match_workers
+
+def get_worker_count(processes):
+    """
+    Returns the number of worker processes to use, 0 meaning one per CPU core.
+    """
+    return processes if processes > 0 else (os.cpu_count() or 1)
+
+def split_into_chunks(count, worker_count):
+    """
+    Splits range(count) into a few chunks per worker so the load stays balanced.
+    """
+    size = max(1, -(-count // (worker_count * POOL_TASKS_PER_WORKER)))
+    return [range(start, min(start + size, count)) for start in range(0, count, size)]
+
+class WorkerPool:
+    """
+    Worker processes shared by all stages of one matching run. The processes are
+    started outside of Blender when a stage first has enough work for them and
+    stay alive until close, so a run only pays for spawning them once. After a
+    failure the pool stays disabled and the remaining stages run in Blender.
+    """
+    def __init__(self, processes=1):
+        self.worker_count = get_worker_count(processes)
+        self.executor = None
+        self.failed = False
+
+    @property
+    def enabled(self):
+        return self.worker_count > 1 and not self.failed
+
+    def map(self, function, tasks):
+        """
+        Calls function(*task) for every task in the worker processes and returns
+        the results in task order.
+        """
+        if not tasks:
+            return []
+        if self.executor is None:
+            context = multiprocessing.get_context("spawn")
+            self.executor = ProcessPoolExecutor(max_workers=self.worker_count, mp_context=context)
+        try:
+            return list(self.executor.map(function, *zip(*tasks)))
+        except BaseException:
+            self.failed = True
+            self.close()
+            raise
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+def export_shared_meshes(objects, workers):
+    """
+    Copies the vertex coordinates and edges of the objects into one shared
+    memory block with foreach_get. The caller must release the block.
+    """
+    meshes = [obj.data for obj in objects]
+    vertex_counts = [len(mesh.vertices) for mesh in meshes]
+    edge_counts = [len(mesh.edges) for mesh in meshes]
+    shared = workers.SharedMeshArrays.create(vertex_counts, edge_counts)
+    for index, mesh in enumerate(meshes):
+        mesh.vertices.foreach_get("co", shared.coords_of(index))
+        mesh.edges.foreach_get("vertices", shared.edges_of(index))
+    return shared
+
+def compute_fingerprints_in_pool(objects, pool):
+    """
+    Computes the fingerprints of the objects in the worker processes of the
+    pool, which read the geometry from shared memory.
+    """
+    workers = load_match_workers()
+    triangle_counts = [get_triangle_count(obj.data) for obj in objects]
+    shared = export_shared_meshes(objects, workers)
+    try:
+        tasks = [
+            (shared.descriptor, list(chunk), [triangle_counts[index] for index in chunk])
+            for chunk in split_into_chunks(len(objects), pool.worker_count)
+        ]
+        results = pool.map(workers.fingerprint_chunk, tasks)
+    finally:
+        shared.release(unlink=True)
+    return [fingerprint for chunk in results for fingerprint in chunk]
+
+def compute_fingerprints(objects, pool=None):
+    """
+    Computes the fingerprints of the objects, in the worker processes of the
+    pool when there are enough of them.
+    """
+    if pool and pool.enabled and len(objects) >= POOL_MIN_OBJECTS:
+        try:
+            return compute_fingerprints_in_pool(objects, pool)
+        except (OSError, ImportError, RuntimeError) as e:
+            logger.error(f"Fingerprinting in worker processes failed, continuing in Blender: {e!r}")
+    return [get_object_fingerprint(obj) for obj in objects]
+
+def run_steps(steps):
+    """
+    Runs a step generator to the end and returns its return value.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+def iter_fingerprint_table(collection, exclude=(), pool=None, progress=None):
+    """
+    Step generator looking up the fingerprint of every mesh object in the
+    collection exactly once, reusing cached fingerprints where possible. Objects
+    in `exclude` are left out. Yields after every chunk of objects, with the
+    current stage and counts in the progress dictionary, and returns a table with
+    the objects and their fingerprints as parallel NumPy arrays.
+    """
+    progress = {} if progress is None else progress
+    objects = [obj for obj in collection.all_objects if obj.type == 'MESH' and obj not in exclude]
+    fingerprints = [None] * len(objects)
+    checksums = [None] * len(objects)
+    stale = []
+
+    progress.update(stage=f"Reading {collection.name}", done=0, total=len(objects))
+    for index, obj in enumerate(objects):
+        checksum = checksums[index] = get_geometry_checksum(obj.data)
+        fingerprints[index] = read_cached_fingerprint(obj.data, checksum)
+        if fingerprints[index] is None:
+            stale.append((index, checksum))
+        if (index + 1) % MATCH_CHUNK_SIZE == 0:
+            progress["done"] = index + 1
+            yield
+
+    # With the worker pool every step hands it one batch big enough to pay off
+    chunk_size = POOL_MIN_OBJECTS if pool and pool.enabled else MATCH_CHUNK_SIZE
+    progress.update(stage=f"Fingerprinting {collection.name}", done=0, total=len(stale))
+    for start in range(0, len(stale), chunk_size):
+        chunk = stale[start:start + chunk_size]
+        computed = compute_fingerprints([objects[index] for index, _ in chunk], pool)
+        for (index, checksum), fingerprint in zip(chunk, computed):
+            store_cached_fingerprint(objects[index].data, fingerprint, checksum)
+            fingerprints[index] = fingerprint
+        progress["done"] = start + len(chunk)
+        yield
+
+    table = stack_fingerprints(fingerprints)
+    table["objects"] = objects
+    table["checksums"] = checksums
+    return table
+
+def get_lod_positions(obj, checksum, sample_count):
+    """
+    Returns the stratified subsample of sample_count vertices of a mesh object.
+    Each level is cut when it is first needed and cached until the geometry
+    checksum of the mesh changes or it is evicted.
+    """
+    global _lod_cache_points
+
+    key = (obj.data.as_pointer(), checksum, sample_count)
+    samples = LOD_CACHE.get(key)
+    if samples is not None:
+        LOD_CACHE.move_to_end(key)
+        return samples
+
+    coords = get_vertex_positions(obj)
+    samples = LOD_CACHE[key] = coords[subsample_indices(len(coords), sample_count)]
+    _lod_cache_points += len(samples)
+    while _lod_cache_points > LOD_CACHE_MAX_POINTS and len(LOD_CACHE) > 1:
+        _, evicted = LOD_CACHE.popitem(last=False)
+        _lod_cache_points -= len(evicted)
+    return samples
+
+def clear_lod_cache():
+    global _lod_cache_points
+    LOD_CACHE.clear()
+    _lod_cache_points = 0
+
+def export_shared_samples(table, indices, sample_count, workers):
+    """
+    Copies the level of detail subsamples of sample_count vertices of the
+    objects at the given table indices into one shared memory block. The
+    caller must release the block.
+    """
+    samples = [get_lod_positions(table["objects"][index], table["checksums"][index], sample_count) for index in indices]
+    shared = workers.SharedMeshArrays.create([len(positions) for positions in samples], [0] * len(samples))
+    for slot, positions in enumerate(samples):
+        shared.coords_of(slot)[:] = positions.ravel()
+    return shared
+
+def score_candidate_pairs_in_pool(pairs, kn5_table, rdc_table, sample_count, pool):
+    """
+    Computes the rigid fit residuals of the pairs in the worker processes of the
+    pool. Only the subsamples of the current level of the objects that take part
+    in a pair are exported to shared memory.
+    """
+    workers = load_match_workers()
+    rdc_used = sorted({rdc_index for _, rdc_index in pairs})
+    kn5_used = sorted({kn5_index for kn5_index, _ in pairs})
+    rdc_slots = {rdc_index: slot for slot, rdc_index in enumerate(rdc_used)}
+    kn5_slots = {kn5_index: slot for slot, kn5_index in enumerate(kn5_used)}
+
+    rdc_shared = export_shared_samples(rdc_table, rdc_used, sample_count, workers)
+    kn5_shared = None
+    try:
+        kn5_shared = export_shared_samples(kn5_table, kn5_used, sample_count, workers)
+        slot_pairs = [(rdc_slots[rdc_index], kn5_slots[kn5_index]) for kn5_index, rdc_index in pairs]
+        tasks = [
+            (rdc_shared.descriptor, kn5_shared.descriptor, [slot_pairs[index] for index in chunk])
+            for chunk in split_into_chunks(len(slot_pairs), pool.worker_count)
+        ]
+        results = pool.map(workers.residual_chunk, tasks)
+    finally:
+        rdc_shared.release(unlink=True)
+        if kn5_shared:
+            kn5_shared.release(unlink=True)
+    return [residual for chunk in results for residual in chunk]
+
+def score_candidate_pairs(pairs, kn5_table, rdc_table, sample_count, pool=None):
+    """
+    Returns the rigid fit residual of every (kn5_index, rdc_index) pair, fitting
+    the RDC subsample of sample_count vertices onto the kn5 one. Both meshes of a
+    pair share a vertex count, so both subsamples pick corresponding vertices.
+    """
+    kn5_objects = kn5_table["objects"]
+    rdc_objects = rdc_table["objects"]
+    if pool and pool.enabled and len(pairs) >= POOL_MIN_PAIRS:
+        try:
+            return score_candidate_pairs_in_pool(pairs, kn5_table, rdc_table, sample_count, pool)
+        except (OSError, ImportError, RuntimeError) as e:
+            logger.error(f"Verifying matches in worker processes failed, continuing in Blender: {e!r}")
+
+    return [
+        rigid_fit_residual(
+            get_lod_positions(rdc_objects[rdc_index], rdc_table["checksums"][rdc_index], sample_count),
+            get_lod_positions(kn5_objects[kn5_index], kn5_table["checksums"][kn5_index], sample_count)
+        )
+        for kn5_index, rdc_index in pairs
+    ]
+
+def verify_candidate_pairs(pairs, kn5_table, rdc_table, pool=None, progress=None):
+    """
+    Step generator checking the candidate pairs coarse to fine through the
+    levels of detail in LOD_SAMPLE_COUNTS. Every level fits the pairs still
+    ambiguous after the previous one, so dense meshes only pay for the fine
+    levels when the coarse ones cannot tell their candidates apart. Yields after
+    every chunk of pairs and returns a dictionary mapping each accepted pair to
+    its residual. Pairs with an object deleted in between are dropped.
+    """
+    progress = {} if progress is None else progress
+    kn5_objects = kn5_table["objects"]
+    rdc_objects = rdc_table["objects"]
+    limits = {pair: residual_limit(kn5_table["extents"][pair[0]]) for pair in pairs}
+    accepted = {}
+    pending = list(pairs)
+
+    for level, sample_count in enumerate(LOD_SAMPLE_COUNTS):
+        if not pending:
+            break
+
+        # With the worker pool every step hands it one batch big enough to pay off
+        chunk_size = POOL_MIN_PAIRS if pool and pool.enabled else MATCH_CHUNK_SIZE
+        progress.update(stage=f"Verifying on {sample_count} vertices", done=0, total=len(pending))
+        promoted = []
+        level_accepted_count = 0
+        for start in range(0, len(pending), chunk_size):
+            chunk = [pair for pair in pending[start:start + chunk_size] if object_exists(kn5_objects[pair[0]]) and object_exists(rdc_objects[pair[1]])]
+            residuals = score_candidate_pairs(chunk, kn5_table, rdc_table, sample_count, pool)
+            # Meshes no larger than the sample were fitted on all their vertices
+            final = [level == len(LOD_SAMPLE_COUNTS) - 1 or kn5_table["counts"][pair[0]] <= sample_count for pair in chunk]
+            chunk_accepted, chunk_promoted = split_lod_candidates(chunk, residuals, [limits[pair] for pair in chunk], final)
+            accepted.update(chunk_accepted)
+            promoted.extend(chunk_promoted)
+            level_accepted_count += len(chunk_accepted)
+            progress["done"] = start + len(pending[start:start + chunk_size])
+            yield
+
+        logger.info(f"Verified {len(pending)} pairs on {sample_count} vertices: {level_accepted_count} accepted, {len(promoted)} promoted.")
+        pending = promoted
+
+    return accepted
+
+def build_fingerprint_buckets(table):
+    """
+    Groups the objects of a fingerprint table by their exact fingerprint key
+    (vertex count and triangle count) and builds a KD-tree
+    over the centers of each group. Returns a dictionary mapping each key to its
+    KD-tree, whose indices point back into the table.
+    """
+    members_by_key = {}
+    for index in range(len(table["objects"])):
+        members_by_key.setdefault(bucket_key(table, index), []).append(index)
+
+    buckets = {}
+    for key, members in members_by_key.items():
+        tree = KDTree(len(members))
+        for index in members:
+            tree.insert(table["centers"][index], index)
+        tree.balance()
+        buckets[key] = tree
+
+    return buckets
+
+def apply_matches_and_store_data(scene):
+    """
+    Moves each RDC object of the match table onto its kn5 object by writing the
+    kn5 world matrix, and stores the original names and target names for
+    reparenting and renaming later. All matrices are written in one pass with a
+    single view layer update.
+    """
+    object_data = {}  # Dictionary to store references between RDC and target KN5 objects
+
+    for obj, target_obj, _ in get_valid_matches(scene):
+        if obj.type != 'MESH':
+            continue
+
+        object_data[obj.name] = {
+            "rdc_object": obj,
+            "target_object": target_obj,
+            "original_name": obj.name,
+            "target_name": target_obj.name,
+            "target_parent": target_obj.parent,
+        }
+
+        # The preview constraint would otherwise keep overriding the new matrix
+        preview_constraint = obj.constraints.get(PREVIEW_CONSTRAINT_NAME)
+        if preview_constraint:
+            obj.constraints.remove(preview_constraint)
+        obj.matrix_world = target_obj.matrix_world.copy()
+
+    if object_data:
+        bpy.context.view_layer.update()
+        logger.info(f"Moved {len(object_data)} matched objects onto their kn5 targets.")
+
+    return object_data
+
 
 def apply_constraints_and_store_data(collection):
     """
     Applies the 'Copy Transforms' constraint to each object in the specified collection and stores
     the original names and target names for reparenting and renaming later. After applying, the
     object is re-parented to the target while keeping the original transform.
+    Constraints with default settings have already been moved into the match table by
+    migrate_constraint_matches, so only constraints with other settings are left here.
     """
     object_data = {}  # Dictionary to store references between RDC and target KN5 objects
     
@@ -32,7 +473,7 @@ def apply_constraints_and_store_data(collection):
     if bpy.context.mode != 'OBJECT':
         bpy.ops.object.mode_set(mode='OBJECT')
     
-    for obj in collection.objects:
+    for obj in collection.all_objects:
         if obj.type == 'MESH':
             # Check if the object has a 'Copy Transforms' constraint
             copy_transform_constraint = None
@@ -77,10 +518,14 @@ def apply_constraints_and_store_data(collection):
     return object_data
 
 
-def reparent_and_rename_objects(object_data, debug_flag):
+def reparent_and_rename_objects(object_data, debug_flag, registry=None):
     """
     Reparents, renames, adjusts materials, and removes objects from the RDC collection after processing.
+    Renames are planned in the name registry and written once the targets are deleted, so
+    the RDC objects get the exact target names instead of '.001' variants.
     """
+    registry = NameRegistry() if registry is None else registry
+
     kn5_collection = bpy.data.collections.get('kn5')
     rdc_collection = bpy.data.collections.get('RDC')  # Get the RDC collection
 
@@ -92,6 +537,8 @@ def reparent_and_rename_objects(object_data, debug_flag):
         logger.error("RDC collection not found.")
         return
 
+    targets_to_delete = []  # Deleted together once all objects are processed
+
     for data in object_data.values():
         obj = data["rdc_object"]
         target_obj = data["target_object"]
@@ -129,35 +576,41 @@ def reparent_and_rename_objects(object_data, debug_flag):
         except ReferenceError:
             logger.warning(f"Target object '{target_name}' is no longer valid and has been skipped.")
 
-        # Rename the RDC object to the target's original name
-        obj.name = target_name
+        # Rename the RDC object to the target's original name once the target is gone
+        registry.request(obj, target_name)
 
         # Reparent the RDC object to the target's parent, keeping the transform
         obj.parent = target_parent
         obj.matrix_parent_inverse = target_parent.matrix_world.inverted() if target_parent else obj.matrix_parent_inverse
 
         # Add the RDC object to the KN5 collection if it's not already there
-        if obj.name not in kn5_collection.objects:
+        users = obj.users_collection
+        if kn5_collection not in users:
             kn5_collection.objects.link(obj)
         
-        # Remove the RDC object from the RDC collection
-        if obj.name in rdc_collection.objects:
-            rdc_collection.objects.unlink(obj)
+        # Remove the RDC object from the RDC collection and its matched/unmatched children
+        for collection in [rdc_collection, *rdc_collection.children_recursive]:
+            if collection in users:
+                collection.objects.unlink(obj)
 
         # Handle the debug flag for hiding or deleting the target object
         if debug_flag:
             target_obj.hide_viewport = True
         else:
-            # Delete only the target object
-            try:
-                target_obj.select_set(True)
-                bpy.context.view_layer.objects.active = target_obj
-                bpy.ops.object.delete()
-                logger.info(f"Deleted the target object '{target_name}'.")
-            except ReferenceError:
-                logger.warning(f"Failed to delete target object '{target_name}', as it no longer exists.")
-
-def manual_add_copy_transforms_constraint():
+            targets_to_delete.append(target_obj)
+
+    # Delete only the target objects, all in one call
+    if targets_to_delete:
+        for target_obj in targets_to_delete:
+            registry.release(target_obj)
+        deleted_count = remove_objects(targets_to_delete)
+        logger.info(f"Deleted {deleted_count} target objects.")
+
+    # Write all renames now that the target names are free
+    registry.plan_suffix_cleanup()
+    registry.apply()
+
+def manual_add_match():
     selected_objects = bpy.context.selected_objects
     active_object = bpy.context.active_object
 
@@ -174,12 +627,13 @@ def manual_add_copy_transforms_constraint():
     # Determine the target object
     target_object = [obj for obj in selected_objects if obj != active_object][0]
 
-    # Add Copy Transforms constraint to the active object
-    constraint = active_object.constraints.new(type='COPY_TRANSFORMS')
-    constraint.name = "Copy Transforms"
-    constraint.target = target_object
+    # Record the pair with the active object taking the place of the target
+    scene = bpy.context.scene
+    add_match(scene, active_object, target_object)
+    refresh_match_preview(scene)
+    update_match_collections(scene)
 
-    print(f"Copy Transforms constraint applied: {active_object.name} -> {target_object.name}")
+    print(f"Match added: {active_object.name} -> {target_object.name}")
 
 
 def main_apply_materials_and_constraints(debug_flag):
@@ -192,174 +646,439 @@ def main_apply_materials_and_constraints(debug_flag):
         logger.error("RDC collection not found.")
         return
 
-    # Apply constraints and store references for reparenting and renaming
-    object_data = apply_constraints_and_store_data(rdc_collection)
+    scene = bpy.context.scene
+    migrate_constraint_matches(scene, rdc_collection)
+
+    # Apply the match table, then any constraints that could not be moved into it,
+    # and store references for reparenting and renaming
+    object_data = apply_matches_and_store_data(scene)
+    object_data.update(apply_constraints_and_store_data(rdc_collection))
+    applied_objects = {data["rdc_object"] for data in object_data.values()}
     
     # Reparent and rename objects
     reparent_and_rename_objects(object_data, debug_flag)
 
+    # The applied pairs are done, drop them from the table
+    remove_matches(scene, lambda item: item.rdc_object in applied_objects or not item.kn5_object)
 
-def find_objects_with_multiple_constraints(collection, constraint_type='COPY_TRANSFORMS'):
-    """
-    Loops through all objects in the specified collection and checks if there are multiple
-    constraints of the specified type. Returns a list of objects with multiple constraints.
-    """
-    objects_with_multiple_constraints = []
-
-    for obj in collection.objects:
-        # Count constraints of the specified type
-        constraint_count = sum(1 for constraint in obj.constraints if constraint.type == constraint_type)
-
-        # If there are multiple constraints, add the object to the list
-        if constraint_count > 1:
-            objects_with_multiple_constraints.append(obj)
-            logger.warning(f"Object '{obj.name}' has {constraint_count} '{constraint_type}' constraints.")
-
-    return objects_with_multiple_constraints
-
-
-def match_meshes(collection1, collection2, threshold):
-    """
-    Matches meshes from collection1 (corrupted) to collection2 (corrected).
-    Ensures multiple constraints are avoided and retries for alternate matches.
-    """
-    unmatched_meshes = []
-    used_objects = set()  # Track objects that already have constraints
-
-    for obj1 in collection1.objects:
-        if obj1.type == 'MESH':
-            obj1_vertex_count, obj1_center = get_vertex_count_and_center(obj1)
-            best_match = None
-            best_distance = float('inf')
-
-            # Loop through second collection to find best match
-            for obj2 in collection2.objects:
-                if obj2.type == 'MESH' and obj2 not in used_objects:
-                    obj2_vertex_count, obj2_center = get_vertex_count_and_center(obj2)
-
-                    if obj1_vertex_count == obj2_vertex_count:
-                        # Calculate the distance between centers
-                        distance = (obj1_center - obj2_center).length
-
-                        # Check if the distance is within the threshold and better than current best
-                        if distance <= threshold and distance < best_distance:
-                            # Check if this obj2 already has a matching constraint
-                            constraint_exists = False
-                            for c in obj2.constraints:
-                                if c.type == 'COPY_TRANSFORMS' and c.target == obj1:
-                                    constraint_exists = True
-                                    break
-
-                            if not constraint_exists:
-                                best_match = obj2
-                                best_distance = distance
-
-            # If we found a best match, apply the constraint
-            if best_match:
-                constraint = best_match.constraints.new(type='COPY_TRANSFORMS')
-                constraint.target = obj1
-                used_objects.add(best_match)  # Mark this object as used
-                logger.info(f"Matched {obj1.name} to {best_match.name} with distance {best_distance:.4f}.")
-            else:
-                unmatched_meshes.append(obj1.name)
-                logger.warning(f"No match found for {obj1.name}.")
-
-    # Check for multiple constraints post-application
-    rdc_collection = bpy.data.collections.get('RDC')
-    if rdc_collection:
-        problematic_objects = find_objects_with_multiple_constraints(rdc_collection)
-        if problematic_objects:
-            logger.warning(f"Objects with multiple constraints: {[obj.name for obj in problematic_objects]}")
-
-    return unmatched_meshes
-
-
-# Function to hide objects with constraints and their targets
-def hide_objects_with_constraints():
-    # Ensure the collection named "RDC" exists
-    rdc_collection = bpy.data.collections.get("RDC")
-    if not rdc_collection:
-        print("Collection named 'RDC' not found.")
-        return
 
-    # Iterate through all objects in the RDC collection
-    for obj in rdc_collection.objects:
-        # Check if the object has constraints
-        for constraint in obj.constraints:
-            if constraint.type == 'COPY_TRANSFORMS':  # Adjust constraint type as needed
-                target = constraint.target
-                if target:
-                    # Hide the object and its target from the viewport
-                    obj.hide_viewport = True
-                    target.hide_viewport = True
-                    print(f"Hid {obj.name} and its target {target.name}")
-                else:
-                    print(f"Constraint on {obj.name} has no target.")
-    print("Completed hiding objects with constraints and their targets.")
+def find_existing_matches(scene):
+    """
+    Returns the RDC objects already paired in the match table, and the set of
+    their kn5 partners.
+    """
+    matches = get_valid_matches(scene)
+    return {rdc_object for rdc_object, _, _ in matches}, {kn5_object for _, kn5_object, _ in matches}
 
 
-# Function to make objects with constraints and their targets visible
-def make_objects_with_constraints_visible():
-    # Ensure the collection named "RDC" exists
-    rdc_collection = bpy.data.collections.get("RDC")
-    if not rdc_collection:
-        print("Collection named 'RDC' not found.")
-        return
+def match_meshes(collection1, collection2, threshold, incremental=False, verify=False, processes=1, auto_threshold=False, use_textures=False):
+    """
+    Runs iter_match_meshes to the end and returns the names of the kn5 meshes
+    left without a match.
+    """
+    return run_steps(iter_match_meshes(collection1, collection2, threshold, incremental, verify, processes, auto_threshold, use_textures))
+
+
+def iter_match_meshes(collection1, collection2, threshold, incremental=False, verify=False, processes=1, auto_threshold=False, use_textures=False, progress=None):
+    """
+    Matches meshes from collection1 (corrupted) to collection2 (corrected).
+    Candidates must share the full geometric fingerprint (see mesh_fingerprints)
+    and have centers within the threshold. All candidate pairs are collected first and then
+    assigned one-to-one so the total center distance is minimal, instead of
+    letting earlier objects take the partners of later ones.
+    Matches are written to the scene's match table (see match_table), replacing
+    earlier entries that use either object.
+    In incremental mode objects that are already paired in the table are
+    skipped on both sides, so only unmatched kn5 meshes and newly imported RDC
+    meshes are considered.
+    With verify enabled every candidate is also checked with a rigid fit of
+    vertex subsamples, coarse to fine (see verify_candidate_pairs). Pairs whose RMS residual is too large are dropped, and the
+    residual is added to the center distance as the assignment cost.
+    Fingerprinting and verification of large scenes run in up to `processes`
+    worker processes (0 for one per CPU core), started once for the whole run.
+    With auto_threshold the nearest candidates of every kn5 object are collected
+    regardless of distance and the threshold is picked from their distribution
+    (see pick_threshold) before assigning, falling back to `threshold` when the
+    distances show no clear gap. The picked value is written back to the scene.
+    With use_textures, objects with several candidates also compare texture
+    signatures (see texture_signatures): candidates whose textures share none
+    with the kn5 object's are dropped, and contested pairs with more textures in
+    common win ties in the assignment.
+    This is a step generator: it yields after every chunk of objects or pairs,
+    with the current stage and counts in the progress dictionary, and returns
+    the names of the kn5 meshes left without a match. Closing it while
+    candidates are being searched still assigns and stores the pairs found so
+    far. Closing it while they are verified, or an error, stores nothing.
+    """
+    progress = {} if progress is None else progress
 
-    # Iterate through all objects in the RDC collection
-    for obj in rdc_collection.objects:
-        # Check if the object has constraints
-        for constraint in obj.constraints:
-            if constraint.type == 'COPY_TRANSFORMS':  # Adjust constraint type as needed
-                target = constraint.target
-                if target:
-                    # Make the object and its target visible in the viewport
-                    obj.hide_viewport = False
-                    target.hide_viewport = False
-                    print(f"Made {obj.name} and its target {target.name} visible")
+    # Bring pairs from older constraint based files into the table and forget
+    # entries whose objects were deleted
+    scene = bpy.context.scene
+    migrate_constraint_matches(scene, collection2)
+    remove_matches(scene, lambda item: not item.rdc_object or not item.kn5_object)
+
+    matched_rdc, matched_kn5 = find_existing_matches(scene) if incremental else (set(), set())
+    if incremental:
+        logger.info(f"Incremental matching, skipping {len(matched_kn5)} kn5 and {len(matched_rdc)} RDC objects already paired.")
+
+    # Fingerprint both collections once, matching only reads from these tables
+    pool = WorkerPool(processes)
+    try:
+        progress["unmatched_meshes"] = yield from iter_match_candidates(
+            collection1, collection2, threshold, matched_kn5, matched_rdc, verify, pool, auto_threshold, use_textures, progress
+        )
+    finally:
+        pool.close()
+        clear_lod_cache()
+
+    return progress["unmatched_meshes"]
+
+
+def iter_match_candidates(collection1, collection2, threshold, matched_kn5, matched_rdc, verify, pool, auto_threshold, use_textures, progress):
+    """
+    Step generator doing the work of iter_match_meshes with the objects already
+    paired left out and the worker pool of the run.
+    """
+    kn5_table = yield from iter_fingerprint_table(collection1, matched_kn5, pool, progress)
+    rdc_table = yield from iter_fingerprint_table(collection2, matched_rdc, pool, progress)
+    rdc_buckets = build_fingerprint_buckets(rdc_table)
+    kn5_objects = kn5_table["objects"]
+    rdc_objects = rdc_table["objects"]
+    texture_cache = TextureSignatureCache() if use_textures else None
+
+    found_pairs = []
+    distances = {}
+    searched = 0
+    texture_skipped = 0
+
+    def store_found_pairs():
+        if texture_skipped:
+            logger.warning(f"Texture check skipped for {texture_skipped} kn5 objects, they or all their candidates have no readable textures.")
+        pairs = apply_auto_threshold(found_pairs, distances, threshold) if auto_threshold else found_pairs
+        return (yield from store_matches(kn5_table, rdc_table, pairs, distances, searched, verify, pool, texture_cache, progress))
+
+    progress.update(stage="Searching candidates", done=0, total=len(kn5_objects), candidates=0, unmatched=0)
+    try:
+        for kn5_index in range(len(kn5_objects)):
+            # Cheapest first: the exact fingerprint key picks the bucket, the KD-tree
+            # keeps centers within the threshold, then the shape features must agree
+            tree = rdc_buckets.get(bucket_key(kn5_table, kn5_index))
+            center = kn5_table["centers"][kn5_index]
+            if not tree:
+                candidates = []
+            elif auto_threshold:
+                candidates = tree.find_n(center, AUTO_THRESHOLD_NEIGHBOURS)
+            else:
+                candidates = tree.find_range(center, threshold)
+            if candidates:
+                compatible = shape_compatible(kn5_table, kn5_index, rdc_table, [found[1] for found in candidates])
+                candidates = [found for found, keep in zip(candidates, compatible) if keep]
+
+            if texture_cache and len(candidates) > 1:
+                # Identical geometry left, drop the candidates with entirely different textures
+                # unless that would drop all of them
+                kn5_signature = texture_cache.get(kn5_objects[kn5_index])
+                rdc_signatures = [texture_cache.get(rdc_objects[found[1]]) for found in candidates]
+                if kn5_signature and any(rdc_signatures):
+                    textured = [found for found, signature in zip(candidates, rdc_signatures) if textures_compatible(kn5_signature, signature)]
+                    candidates = textured or candidates
                 else:
-                    print(f"Constraint on {obj.name} has no target.")
-    print("Completed making objects with constraints and their targets visible.")
-
-def rename_objects_with_suffix():
-    """
-    Goes through all objects in the scene and renames objects ending with '.001' if
-    the name without '.001' does not exist.
-    """
-    for obj in bpy.data.objects:
-        # Check if the object name ends with ".001"
-        if obj.name.endswith(".001"):
-            # Generate the name without ".001"
-            base_name = obj.name[:-4]  # Remove the last 4 characters (".001")
-
-            # Check if any object with the base name exists
-            if not bpy.data.objects.get(base_name):
-                # Rename the object to the base name
-                old_name = obj.name
-                obj.name = base_name
-                print(f"Renamed '{old_name}' to '{obj.name}'")
+                    texture_skipped += 1
+                    logger.debug(f"Texture check skipped for {kn5_objects[kn5_index].name}, no textures to compare.")
+
+            for _, rdc_index, distance in candidates:
+                distances[(kn5_index, rdc_index)] = distance
+                found_pairs.append((kn5_index, rdc_index))
+
+            searched = kn5_index + 1
+            progress["candidates" if candidates else "unmatched"] += 1
+            if searched % MATCH_CHUNK_SIZE == 0:
+                progress["done"] = searched
+                yield
+    except GeneratorExit:
+        # Closed to cancel, keep the partial results. A closed generator cannot
+        # yield any more, so they are stored in one go. Any other error leaves
+        # the match table untouched.
+        progress["unmatched_meshes"] = run_steps(store_found_pairs())
+        raise
+
+    progress["unmatched_meshes"] = yield from store_found_pairs()
+    return progress["unmatched_meshes"]
+
+
+def apply_auto_threshold(found_pairs, distances, fallback):
+    """
+    Picks the matching threshold from the distance of every kn5 object to its
+    nearest candidate, logs their histogram, writes the threshold back to the
+    scene and returns the pairs within it.
+    """
+    nearest = {}
+    for pair in found_pairs:
+        nearest[pair[0]] = min(nearest.get(pair[0], float("inf")), distances[pair])
+
+    for low, high, count in distance_histogram(list(nearest.values())):
+        logger.info(f"Nearest candidate distance {low:.0e} to {high:.0e}: {count:>7} {'#' * min(count, 60)}")
+
+    threshold = pick_threshold(list(nearest.values()))
+    if threshold is None:
+        threshold = fallback
+        logger.warning(f"Nearest candidate distances show no clear gap, keeping the threshold of {threshold:.6g}.")
+    else:
+        logger.info(f"Picked a matching threshold of {threshold:.6g}.")
+        bpy.context.scene.matching_threshold = threshold
+
+    return [pair for pair in found_pairs if distances[pair] <= threshold]
+
+
+def add_texture_tie_breaks(candidate_pairs, kn5_objects, rdc_objects, texture_cache):
+    """
+    Adds a tiny cost to contested (kn5_index, rdc_index, cost) pairs, those
+    sharing an object with another pair, the fewer textures they have in common.
+    """
+    kn5_counts = Counter(pair[0] for pair in candidate_pairs)
+    rdc_counts = Counter(pair[1] for pair in candidate_pairs)
+
+    tie_broken = []
+    for kn5_index, rdc_index, cost in candidate_pairs:
+        if kn5_counts[kn5_index] > 1 or rdc_counts[rdc_index] > 1:
+            similarity = texture_similarity(texture_cache.get(kn5_objects[kn5_index]), texture_cache.get(rdc_objects[rdc_index]))
+            cost += TEXTURE_TIE_BREAK * (1.0 - similarity)
+        tie_broken.append((kn5_index, rdc_index, cost))
+    return tie_broken
+
+
+def store_matches(kn5_table, rdc_table, found_pairs, distances, searched, verify=False, pool=None, texture_cache=None, progress=None):
+    """
+    Step generator that verifies the candidate pairs if requested, assigns them
+    one-to-one and writes the result to the match table. With a texture_cache,
+    texture signatures break ties between contested pairs. Only the first
+    `searched` kn5 objects were searched for candidates. Objects deleted while
+    the run was paused are left out. Returns the names of the searched kn5
+    objects left without a match.
+    """
+    scene = bpy.context.scene
+    kn5_objects = kn5_table["objects"]
+    rdc_objects = rdc_table["objects"]
+    unmatched_meshes = []
+
+    residuals = {}
+    if verify:
+        # Drop pairs that do not line up and add the residual to the cost
+        residuals = yield from verify_candidate_pairs(found_pairs, kn5_table, rdc_table, pool, progress)
+        found_pairs = [pair for pair in found_pairs if pair in residuals]
+
+    # Nothing yields from here on, so objects that still exist stay valid
+    deleted_kn5 = {index for index in range(searched) if not object_exists(kn5_objects[index])}
+    deleted_rdc = {index for index in {pair[1] for pair in found_pairs} if not object_exists(rdc_objects[index])}
+    if deleted_kn5 or deleted_rdc:
+        logger.warning(f"Skipped {len(deleted_kn5)} kn5 and {len(deleted_rdc)} RDC objects deleted during matching.")
+
+    candidate_pairs = [
+        (kn5_index, rdc_index, distances[(kn5_index, rdc_index)] + residuals.get((kn5_index, rdc_index), 0.0))
+        for kn5_index, rdc_index in found_pairs
+        if kn5_index not in deleted_kn5 and rdc_index not in deleted_rdc
+    ]
+
+    if texture_cache:
+        candidate_pairs = add_texture_tie_breaks(candidate_pairs, kn5_objects, rdc_objects, texture_cache)
+
+    # Solve the one-to-one assignment over all candidates at once
+    matches = {kn5_index: rdc_index for kn5_index, rdc_index, _ in assign_candidates(candidate_pairs)}
+    new_matches = []
+
+    if searched < len(kn5_objects):
+        logger.warning(f"Matching was cancelled, {len(kn5_objects) - searched} kn5 objects were not searched.")
+
+    for kn5_index, obj1 in enumerate(kn5_objects[:searched]):
+        if kn5_index in deleted_kn5:
+            continue
+
+        # If we found a match, record it in the table
+        if kn5_index in matches:
+            rdc_index = matches[kn5_index]
+            obj2 = rdc_objects[rdc_index]
+            distance = distances[(kn5_index, rdc_index)]
+            if verify:
+                residual = residuals[(kn5_index, rdc_index)]
+                new_matches.append((obj2, obj1, distance, residual, -1.0))
+                logger.info(f"Matched {obj1.name} to {obj2.name} with distance {distance:.4f} and residual {residual:.6f}.")
             else:
-                print(f"Skipped renaming '{obj.name}', '{base_name}' already exists.")
+                new_matches.append((obj2, obj1, distance, -1.0, -1.0))
+                logger.info(f"Matched {obj1.name} to {obj2.name} with distance {distance:.4f}.")
+        else:
+            unmatched_meshes.append(obj1.name)
+            logger.warning(f"No match found for {obj1.name}.")
+
+    # Write all pairs to the table at once
+    add_matches(scene, new_matches)
+
+    refresh_match_preview(scene)
+    update_match_collections(scene)
+
+    return unmatched_meshes
+
+
+def match_meshes_by_overlap(collection1, collection2, voxel_size, min_fraction, incremental=False):
+    """
+    Matches meshes from collection2 (RDC) to collection1 (kn5) by how much they
+    overlap, for draws that split or merge meshes differently than the kn5.
+    The vertices of both sides are hashed into voxels of voxel_size (see
+    voxel_overlap) and every RDC mesh is paired with the kn5 mesh holding at
+    least min_fraction of its vertices. Several RDC meshes can be paired with
+    the same kn5 mesh. In incremental mode RDC objects already in the match
+    table are skipped. Returns the names of the kn5 meshes left without a match.
+    """
+    scene = bpy.context.scene
+    migrate_constraint_matches(scene, collection2)
+    remove_matches(scene, lambda item: not item.rdc_object or not item.kn5_object)
+
+    matched_rdc = find_existing_matches(scene)[0] if incremental else set()
+    kn5_objects = [obj for obj in collection1.all_objects if obj.type == 'MESH']
+    rdc_objects = [obj for obj in collection2.all_objects if obj.type == 'MESH' and obj not in matched_rdc]
+
+    kn5_positions = [get_vertex_positions(obj) for obj in kn5_objects]
+    rdc_positions = [get_vertex_positions(obj) for obj in rdc_objects]
+    voxel_table = build_voxel_table(kn5_positions, voxel_size)
+    rdc_indices, kn5_indices, fractions = score_overlaps(voxel_table, rdc_positions, voxel_size)
+    assignments = assign_overlaps(rdc_indices, kn5_indices, fractions, voxel_table[2], min_fraction)
+
+    # Number of kn5 meshes each RDC mesh touches and the total fraction overlapping them
+    span_counts = np.bincount(rdc_indices, minlength=len(rdc_objects))
+    span_fractions = np.bincount(rdc_indices, weights=fractions, minlength=len(rdc_objects))
+
+    new_matches = []
+    for rdc_index, obj2 in enumerate(rdc_objects):
+        if rdc_index in assignments:
+            kn5_index, fraction = assignments[rdc_index]
+            obj1 = kn5_objects[kn5_index]
+            # Center distance as in exact matching, the fraction goes to its own field
+            distance = float(np.linalg.norm(rdc_positions[rdc_index].mean(axis=0) - kn5_positions[kn5_index].mean(axis=0)))
+            new_matches.append((obj2, obj1, distance, -1.0, fraction))
+            logger.info(f"Matched {obj2.name} to {obj1.name} with {fraction:.1%} of its vertices overlapping.")
+            continue
+
+        # A draw batching several kn5 meshes only overlaps each of them partly
+        if span_counts[rdc_index] > 1 and span_fractions[rdc_index] >= min_fraction:
+            logger.warning(f"{obj2.name} spans {span_counts[rdc_index]} kn5 meshes and was left unmatched.")
+
+    add_matches(scene, new_matches, exclusive=False)
+    logger.info(f"Overlap matching paired {len(assignments)} of {len(rdc_objects)} RDC meshes.")
+
+    matched_kn5 = find_existing_matches(scene)[1]
+    unmatched_meshes = [obj.name for obj in kn5_objects if obj not in matched_kn5]
+
+    refresh_match_preview(scene)
+    update_match_collections(scene)
+
+    return unmatched_meshes
+
+
+# Function to show or hide the matched objects and their targets
+def set_matched_objects_hidden(hidden, suffix=MATCHED_SUFFIX):
+    # Every writer of the match table re-sorts the collections, so a toggle
+    # only flips the two child collections with the suffix
+    changed = set_match_collections_hidden(bpy.context.view_layer, hidden, suffix)
+
+    state = "Hid" if hidden else "Made visible"
+    print(f"{state} {changed} {suffix.strip('_').lower()} collections.")
+
 
 
 class MatchMeshesOperator(bpy.types.Operator):
     bl_idname = "mesh_matcher.match_meshes"
     bl_label = "Match Meshes"
-    bl_description = "Used to match meshes from the RDC file to the imported KN5 file. This can take some time, please be sure to let the action complete or check console for progress"
+    bl_description = "Used to match meshes from the RDC file to the imported KN5 file. Runs in the background with progress in the status bar, press Esc to stop early and keep the matches found so far"
+
+    _timer = None
+    _steps = None
+    _progress = None
+
+    def invoke(self, context, event):
+        scene = context.scene
+        collection1 = bpy.data.collections.get('kn5')
+        collection2 = bpy.data.collections.get('RDC')
+
+        # Overlap matching is vectorized and runs in one go
+        if not (collection1 and collection2) or scene.matching_mode == 'OVERLAP':
+            return self.execute(context)
+
+        self._progress = {}
+        self._steps = iter_match_meshes(
+            collection1, collection2, scene.matching_threshold, scene.incremental_matching,
+            scene.verify_matches, scene.matching_processes, scene.auto_threshold, scene.texture_matching, self._progress
+        )
+
+        wm = context.window_manager
+        wm.progress_begin(0, 100)
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            # Closing the steps still stores the pairs found so far
+            self._steps.close()
+            self.finish(context)
+            self.report({'WARNING'}, f"Matching cancelled, kept {len(context.scene.rdac_matches)} pairs.")
+            return {'FINISHED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        # Run steps until this tick's time budget is used up
+        deadline = time.perf_counter() + MATCH_TICK_SECONDS
+        try:
+            while time.perf_counter() < deadline:
+                next(self._steps)
+        except StopIteration as stop:
+            self.finish(context)
+            self.report_result(context.scene, stop.value)
+            return {'FINISHED'}
+        except Exception:
+            self.finish(context)
+            raise
+
+        progress = self._progress
+        fraction = progress["done"] / progress["total"] if progress.get("total") else 0.0
+        context.window_manager.progress_update(int(fraction * 100))
+        status = f"{progress['stage']}: {progress['done']}/{progress['total']}"
+        if "candidates" in progress:
+            status += f", {progress['candidates']} with candidates, {progress['unmatched']} unmatched"
+        context.workspace.status_text_set(status + " (Esc to stop)")
+        return {'RUNNING_MODAL'}
+
+    def finish(self, context):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        self._timer = None
+        self._steps = None
+
+    def report_result(self, scene, unmatched):
+        if unmatched:
+            logger.error(f"Unmatched objects: {', '.join(unmatched)}")
+            self.report({'WARNING'}, f"{len(scene.rdac_matches)} pairs matched, {len(unmatched)} kn5 objects unmatched.")
+        else:
+            self.report({'INFO'}, "Mesh matching completed successfully.")
 
     def execute(self, context):
         scene = context.scene
         collection1 = bpy.data.collections.get('kn5')
         collection2 = bpy.data.collections.get('RDC')
         threshold = scene.matching_threshold
+        incremental = scene.incremental_matching
+        verify = scene.verify_matches
+        processes = scene.matching_processes
 
         if collection1 and collection2:
-            unmatched = match_meshes(collection1, collection2, threshold)
-            
-            if unmatched:
-                logger.error(f"Unmatched objects: {', '.join(unmatched)}")
+            if scene.matching_mode == 'OVERLAP':
+                unmatched = match_meshes_by_overlap(collection1, collection2, scene.overlap_voxel_size, scene.overlap_min_fraction, incremental)
             else:
-                self.report({'INFO'}, "Mesh matching completed successfully.")
+                unmatched = match_meshes(collection1, collection2, threshold, incremental, verify, processes, scene.auto_threshold, scene.texture_matching)
+            
+            self.report_result(scene, unmatched)
         else:
             logger.error("One or both collections are missing.")
             self.report({'ERROR'}, "One or both collections are missing.")
@@ -373,7 +1092,6 @@ class ApplyMaterialsConstraintsOperator(bpy.types.Operator):
     def execute(self, context):
         debug_flag = context.scene.debug_flag  # Read the debug flag from the scene
         main_apply_materials_and_constraints(debug_flag)
-        rename_objects_with_suffix()
         self.report({'INFO'}, "Materials and constraints applied successfully.")
         return {'FINISHED'}
 
@@ -383,40 +1101,57 @@ class ManualMatchOperator(bpy.types.Operator):
     bl_label = "Manual Match Meshes"
 
     def execute(self, context):
-        manual_add_copy_transforms_constraint()
+        manual_add_match()
         self.report({'INFO'}, "Matched objects manually.")
         return {'FINISHED'}
 
+class ClearMatchesOperator(bpy.types.Operator):
+    bl_idname = "mesh_matcher.clear_matches"
+    bl_label = "Clear Matches"
+    bl_description = "Removes all pairs from the match table"
+
+    def execute(self, context):
+        scene = context.scene
+        scene.rdac_matches.clear()
+        refresh_match_preview(scene)
+        update_match_collections(scene)
+        self.report({'INFO'}, "Match table cleared.")
+        return {'FINISHED'}
+
+# Which set of objects the Hide and Show operators toggle
+MATCH_SET_ITEMS = [
+    ('MATCHED', "Matched", "Objects paired in the match table"),
+    ('UNMATCHED', "Unmatched", "Objects without a pair in the match table"),
+]
+
 class HideConstraintObjectsOperator(bpy.types.Operator):
     bl_idname = "mesh_matcher.hide_constraint_objects"
     bl_label = "Hide Constraint Objects"
-    bl_description = "Used to hide objects from the RDC collection"
+    bl_description = "Used to hide the matched or unmatched objects of the kn5 and RDC collections"
+
+    match_set: bpy.props.EnumProperty(name="Objects", items=MATCH_SET_ITEMS, default='MATCHED')
 
     def execute(self, context):
-        scene = context.scene
-        
-        if bpy.data.collections.get('RDC'):
-            hide_objects_with_constraints()
-            
-            logger.info(f"Objects with constraints were hidden.")
-            self.report({'INFO'}, "Constraint objects hidden.")
+        suffix = MATCHED_SUFFIX if self.match_set == 'MATCHED' else UNMATCHED_SUFFIX
+        set_matched_objects_hidden(True, suffix)
 
+        logger.info(f"{self.match_set.capitalize()} objects were hidden.")
+        self.report({'INFO'}, f"{self.match_set.capitalize()} objects hidden.")
         return {'FINISHED'}
 
 class ShowConstraintObjectsOperator(bpy.types.Operator):
     bl_idname = "mesh_matcher.show_constraint_objects"
     bl_label = "Show Constraint Objects"
-    bl_description = "Used to show objects from the RDC collection"
+    bl_description = "Used to show the matched or unmatched objects of the kn5 and RDC collections"
+
+    match_set: bpy.props.EnumProperty(name="Objects", items=MATCH_SET_ITEMS, default='MATCHED')
 
     def execute(self, context):
-        scene = context.scene
-        
-        if bpy.data.collections.get('RDC'):
-            make_objects_with_constraints_visible()
-            
-            logger.info(f"Objects with constraints were made visible.")
-            self.report({'INFO'}, "Constraint objects are visible.")
+        suffix = MATCHED_SUFFIX if self.match_set == 'MATCHED' else UNMATCHED_SUFFIX
+        set_matched_objects_hidden(False, suffix)
 
+        logger.info(f"{self.match_set.capitalize()} objects were made visible.")
+        self.report({'INFO'}, f"{self.match_set.capitalize()} objects are visible.")
         return {'FINISHED'}
 
 def register():
@@ -425,6 +1160,7 @@ def register():
     bpy.utils.register_class(HideConstraintObjectsOperator)
     bpy.utils.register_class(ShowConstraintObjectsOperator)
     bpy.utils.register_class(ManualMatchOperator)
+    bpy.utils.register_class(ClearMatchesOperator)
     bpy.types.Scene.debug_flag = bpy.props.BoolProperty(
         name="Debug Flag",
         description="If enabled, hides the KN5 object. If disabled, deletes the KN5 object.",
@@ -437,6 +1173,7 @@ def unregister():
     bpy.utils.unregister_class(HideConstraintObjectsOperator)
     bpy.utils.unregister_class(ShowConstraintObjectsOperator)
     bpy.utils.unregister_class(ManualMatchOperator)
+    bpy.utils.unregister_class(ClearMatchesOperator)
     del bpy.types.Scene.debug_flag
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 import bpy
 import logging
+import mathutils
+from .object_utils import remove_objects
+from .name_registry import NameRegistry
 
 # Set up logging
 logger = logging.getLogger("MeshRenamerReparenter")
@@ -22,42 +25,60 @@ def rename_and_reparent_meshes(debug_flag):
     else:
         parents_collection = bpy.data.collections[parents_collection_name]
 
-    for obj in kn5_collection.objects:
+    # Read the whole hierarchy before changing anything: every mesh with its
+    # parent, grandparent and world matrix. The meshes may sit in the
+    # matched/unmatched child collections.
+    plan = []
+    grandparent_inverses = {}
+    for obj in kn5_collection.all_objects:
         if obj.type != 'MESH' or not obj.parent:
             continue
 
         parent = obj.parent
         grandparent = parent.parent
+        if grandparent and grandparent not in grandparent_inverses:
+            grandparent_inverses[grandparent] = grandparent.matrix_world.inverted()
+        plan.append((obj, parent, grandparent, obj.matrix_world.copy()))
 
-        # Rename the mesh to the parent's name
-        original_name = obj.name
-        obj.name = parent.name
-        logger.info(f"Renamed object '{original_name}' to '{parent.name}'.")
+    # Write the parents and local matrices in one pass. With an identity parent
+    # inverse the local matrix alone places the mesh where it was. The meshes
+    # take their parents' names once the parents are deleted.
+    registry = NameRegistry()
+    identity = mathutils.Matrix.Identity(4)
+    for obj, parent, grandparent, world_matrix in plan:
+        registry.request(obj, parent.name)
 
-        # Store the current world matrix
-        world_matrix = obj.matrix_world.copy()
-
-        # Parent the mesh to the grandparent while keeping transforms
         obj.parent = grandparent
-        obj.matrix_world = world_matrix
+        obj.matrix_parent_inverse = identity
+        obj.matrix_basis = grandparent_inverses[grandparent] @ world_matrix if grandparent else world_matrix
 
-        # Move the parent to the 'Unused_Parents' collection for later deletion
-        if parent.name not in parents_collection.objects:
+    # Move the parents to the 'Unused_Parents' collection for later deletion
+    for parent in dict.fromkeys(parent for _, parent, _, _ in plan):
+        users = parent.users_collection
+        if parents_collection not in users:
             parents_collection.objects.link(parent)
-        if parent.name in kn5_collection.objects:
+        if kn5_collection in users:
             kn5_collection.objects.unlink(parent)
 
+    # Evaluate all the new transforms at once
+    bpy.context.view_layer.update()
+    logger.info(f"Renamed and reparented {len(plan)} meshes.")
+
     # If debug mode is off, delete the 'Unused_Parents' collection and its objects
     if not debug_flag:
-        # Select all objects in the 'Unused_Parents' collection
-        for obj in parents_collection.objects:
-            obj.select_set(True)
-        # Delete the objects
-        bpy.ops.object.delete()
+        # Delete exactly the objects in the 'Unused_Parents' collection, whatever else is selected
+        unused_parents = list(parents_collection.objects)
+        for parent in unused_parents:
+            registry.release(parent)
+        remove_objects(unused_parents)
         # Remove the collection
         bpy.data.collections.remove(parents_collection)
         logger.info("'Unused_Parents' collection and its objects deleted.")
 
+    # Write all renames at once, exact parent names where the parents were deleted
+    registry.plan_suffix_cleanup()
+    registry.apply()
+
     logger.info("Renaming and reparenting completed.")
 
 # Define the new operator for renaming and reparenting meshes
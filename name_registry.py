@@ -0,0 +1,96 @@
+import bpy
+import logging
+import re
+
+# Set up logging
+logger = logging.getLogger("NameRegistry")
+
+# Blender's duplicate name suffix: a dot and at least three digits
+SUFFIX_PATTERN = re.compile(r"^(.*)\.(\d{3,})$")
+
+# Prefix of the temporary names used while applying renames
+TEMPORARY_PREFIX = "\x01rdac_rename_"
+
+
+class NameRegistry:
+    """
+    Plans renames of ID datablocks (objects by default) against an index of
+    all their names built once. Renames are only requested while the plan is
+    built and are written together by apply(), so no rename can push another
+    one onto a '.001' name.
+    """
+    def __init__(self, datablocks=None):
+        self.datablocks = bpy.data.objects if datablocks is None else datablocks
+        self.owners = {datablock.name: datablock for datablock in self.datablocks}
+        self.planned = {}  # Datablock to wanted name, in request order
+
+    def request(self, datablock, name):
+        """
+        Plans to rename a datablock to the given name.
+        """
+        self.planned[datablock] = name
+
+    def release(self, datablock):
+        """
+        Frees the name of a datablock that is about to be deleted. Must be
+        called while the datablock still exists, and the deletion must happen
+        before apply().
+        """
+        if self.owners.get(datablock.name) == datablock:
+            del self.owners[datablock.name]
+        self.planned.pop(datablock, None)
+
+    def fixed_names(self):
+        """
+        Returns the names held by datablocks that are not being renamed.
+        """
+        return {name for name, datablock in self.owners.items() if datablock not in self.planned}
+
+    def plan_suffix_cleanup(self):
+        """
+        Plans to rename datablocks with a numeric suffix ('.001', '.002', ...) back
+        to their base name wherever nothing will hold that name after the planned
+        renames. Of several datablocks with the same free base name the one with
+        the lowest number gets it, the others keep their names.
+        """
+        taken = self.fixed_names() | set(self.planned.values())
+        chains = {}
+        for name, datablock in self.owners.items():
+            match = SUFFIX_PATTERN.match(name)
+            if match and datablock not in self.planned and match.group(1) not in taken:
+                chains.setdefault(match.group(1), []).append((int(match.group(2)), name, datablock))
+
+        for base_name, members in chains.items():
+            self.request(min(members)[2], base_name)
+        return len(chains)
+
+    def apply(self):
+        """
+        Writes every planned rename. Each datablock takes its wanted name, or the
+        lowest free '.NNN' variant of it, in request order. Datablocks whose name
+        changes are first moved to temporary names so their old names cannot
+        block each other. Returns the number of datablocks renamed.
+        """
+        used = self.fixed_names()
+        final_names = {}
+        for datablock, name in self.planned.items():
+            final_name = name
+            number = 0
+            while final_name in used:
+                number += 1
+                final_name = f"{name}.{number:03d}"
+            used.add(final_name)
+            final_names[datablock] = final_name
+
+        changing = [(datablock, datablock.name, name) for datablock, name in final_names.items() if datablock.name != name]
+        for index, (datablock, _, _) in enumerate(changing):
+            datablock.name = f"{TEMPORARY_PREFIX}{index}"
+        for datablock, old_name, name in changing:
+            datablock.name = name
+            logger.debug(f"Renamed '{old_name}' to '{name}'.")
+
+        # The plan is written, start the next one from the current names
+        self.owners = {datablock.name: datablock for datablock in self.datablocks}
+        self.planned = {}
+        logger.info(f"Renamed {len(changing)} datablocks.")
+        return len(changing)
@@ -0,0 +1,42 @@
+import bpy
+import logging
+
+# Set up logging
+logger = logging.getLogger("ObjectUtils")
+
+def object_exists(obj):
+    """
+    Returns False for an object whose datablock was deleted since it was looked up.
+    """
+    try:
+        obj.name
+    except ReferenceError:
+        return False
+    return True
+
+def remove_objects(objects):
+    """
+    Removes the given objects with a single bpy.data.batch_remove call, without
+    touching the selection, then purges the mesh datablocks they leave without
+    users. Objects that were already deleted are skipped. Returns the number of
+    objects removed.
+    """
+    valid_objects = []
+    for obj in dict.fromkeys(objects):
+        if not object_exists(obj):
+            logger.warning("Skipped removing an object that no longer exists.")
+            continue
+        valid_objects.append(obj)
+
+    if not valid_objects:
+        return 0
+
+    meshes = {obj.data for obj in valid_objects if obj.type == 'MESH' and obj.data}
+    bpy.data.batch_remove(valid_objects)
+
+    orphaned_meshes = [mesh for mesh in meshes if mesh.users == 0]
+    if orphaned_meshes:
+        bpy.data.batch_remove(orphaned_meshes)
+
+    logger.info(f"Removed {len(valid_objects)} objects and {len(orphaned_meshes)} orphaned meshes.")
+    return len(valid_objects)
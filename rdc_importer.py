@@ -2,7 +2,8 @@ import sys
 import os
 import logging
 import bpy
-import struct
+import math
+import numpy as np
 
 # Attempt to import renderdoc, if not found, try to add the external libs directory to sys.path and environment variables
 try:
@@ -46,6 +47,9 @@ except ImportError as original_error:
 MAX_VERTICES = 150000
 MAX_INDICES = 450000
 
+# Auto smooth angle used when a draw has no NORMAL attribute to import
+AUTO_SMOOTH_ANGLE = 0.698132  # 30 degrees in radians
+
 # Helper function for logging setup
 def setup_logging(rdc_file_path):
     log_file_path = os.path.join(os.path.dirname(rdc_file_path), 'mesh_import_log.txt')
@@ -309,8 +313,152 @@ def extract_and_save_textures(controller, action, rdc_file_path):
     return textures
 
 
+# Decode one interleaved vertex attribute for every vertex in a single pass
+def decode_vertex_attribute(vertex_data, vertex_count, vertex_byte_stride, input_elem, components):
+    """
+    Returns a (vertex_count, components) float32 array read from the interleaved
+    vertex data, or None when the attribute format is not supported. Normalized
+    integer formats are scaled to [0, 1] / [-1, 1].
+    """
+    fmt = getattr(input_elem, 'format', None)
+    comp_type = fmt.compType if fmt is not None else rd.CompType.Float
+    comp_width = fmt.compByteWidth if fmt is not None else 4
+    if fmt is not None and fmt.compCount < components:
+        return None
+
+    if comp_type == rd.CompType.Float and comp_width in (2, 4):
+        dtype = np.dtype(f'<f{comp_width}')
+    elif comp_type == rd.CompType.UNorm and comp_width in (1, 2):
+        dtype = np.dtype(f'<u{comp_width}')
+    elif comp_type == rd.CompType.SNorm and comp_width in (1, 2):
+        dtype = np.dtype(f'<i{comp_width}')
+    else:
+        return None
+
+    # Drop a trailing vertex that would read past the end of the buffer
+    attribute_end = input_elem.byteOffset + components * comp_width
+    if vertex_count and (vertex_count - 1) * vertex_byte_stride + attribute_end > len(vertex_data):
+        vertex_count -= 1
+
+    values = np.ndarray(
+        (vertex_count, components), dtype=dtype, buffer=vertex_data,
+        offset=input_elem.byteOffset, strides=(vertex_byte_stride, comp_width)
+    ).astype(np.float32)
+
+    if comp_type == rd.CompType.UNorm:
+        values /= np.iinfo(dtype).max
+    elif comp_type == rd.CompType.SNorm:
+        values = np.maximum(values / np.iinfo(dtype).max, -1.0)
+
+    return values
+
+
+# Read the primitive topology of the current draw
+def get_primitive_topology(controller):
+    pipeline_state = controller.GetPipelineState()
+    if not pipeline_state:
+        return rd.Topology.TriangleList
+    return pipeline_state.GetPrimitiveTopology()
+
+
+# Convert strips, lists and restart indices to a plain triangle list
+def convert_to_triangle_list(indices, topology, restart_index, vertex_count):
+    """
+    Converts a decoded index buffer of the given topology into a flat triangle
+    list. Triangle strips are split at restart indices and every odd triangle
+    has its winding flipped back. Degenerate triangles and triangles that
+    reference vertices outside the fetched vertex data are dropped. Returns
+    None for topologies that do not produce triangles.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+
+    if topology == rd.Topology.TriangleList:
+        triangles = indices[:len(indices) // 3 * 3].reshape(-1, 3)
+    elif topology == rd.Topology.TriangleList_Adj:
+        # Every triangle carries three adjacency indices in between its own
+        triangles = indices[:len(indices) // 6 * 6].reshape(-1, 6)[:, ::2]
+    elif topology == rd.Topology.TriangleStrip:
+        # Position of every index inside its strip, counted from the last restart
+        positions = np.arange(len(indices))
+        last_restart = np.maximum.accumulate(np.where(indices == restart_index, positions, -1))
+        strip_position = positions - last_restart - 1
+
+        # Each index from the third one of a strip on closes a triangle
+        ends = np.nonzero(strip_position >= 2)[0]
+        odd = (strip_position[ends] & 1) == 1
+        first = indices[ends - 2]
+        second = indices[ends - 1]
+        triangles = np.stack([
+            np.where(odd, second, first),
+            np.where(odd, first, second),
+            indices[ends],
+        ], axis=1)
+    else:
+        return None
+
+    degenerate = (
+        (triangles[:, 0] == triangles[:, 1])
+        | (triangles[:, 1] == triangles[:, 2])
+        | (triangles[:, 0] == triangles[:, 2])
+    )
+    out_of_range = (triangles >= vertex_count).any(axis=1)
+    if out_of_range.any():
+        logging.warning(f"Dropping {int(out_of_range.sum())} triangles that reference vertices past the fetched vertex data.")
+
+    return triangles[~(degenerate | out_of_range)].ravel()
+
+
+# Drop unreferenced vertices and weld exact duplicates
+def compact_vertices(positions, indices, uvs=None, normals=None):
+    """
+    Removes vertices that no index references and welds vertices whose imported
+    attributes (position, UV, normal) are bitwise identical, then remaps the
+    indices. Vertex order is kept by first occurrence. Returns the compacted
+    positions, indices, uvs and normals.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    if not len(indices) or indices.min() < 0 or indices.max() >= len(positions):
+        return positions, indices, uvs, normals
+
+    attributes = [attribute for attribute in (positions, uvs, normals) if attribute is not None]
+    packed = np.ascontiguousarray(np.hstack(attributes), dtype=np.float32)
+
+    # Only referenced vertices take part, viewed as one opaque row each for unique
+    referenced = np.unique(indices)
+    packed = np.ascontiguousarray(packed[referenced])
+    rows = packed.view(np.dtype((np.void, packed.dtype.itemsize * packed.shape[1]))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+
+    # np.unique sorts by content, so rank the kept vertices by first occurrence instead
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    kept = referenced[first[order]]
+
+    remap = np.full(len(positions), -1, dtype=np.int64)
+    remap[referenced] = rank[inverse.ravel()]
+    indices = remap[indices]
+
+    # Welding collapses zero-area triangles onto repeated vertices, drop them
+    if len(indices) % 3 == 0:
+        triangles = indices.reshape(-1, 3)
+        degenerate = (
+            (triangles[:, 0] == triangles[:, 1])
+            | (triangles[:, 1] == triangles[:, 2])
+            | (triangles[:, 0] == triangles[:, 2])
+        )
+        indices = triangles[~degenerate].ravel()
+
+    return (
+        positions[kept],
+        indices,
+        uvs[kept] if uvs is not None else None,
+        normals[kept] if normals is not None else None,
+    )
+
+
 # Extract and import mesh
-def extract_and_import_mesh(controller, action):
+def extract_and_import_mesh(controller, action, compact_meshes=False):
     logging.info(f"Extracting mesh data for action {action.eventId}")
     controller.SetFrameEvent(action.eventId, True)
 
@@ -336,10 +484,13 @@ def extract_and_import_mesh(controller, action):
             return
 
         position_elem = None
+        normal_elem = None
         uv_elem = None
         for input_elem in vinputs:
             if input_elem.semanticName.lower() == 'position':
                 position_elem = input_elem
+            elif input_elem.semanticName.lower() == 'normal':
+                normal_elem = input_elem
             elif input_elem.semanticName.lower() == 'texcoord':
                 uv_elem = input_elem
 
@@ -360,41 +511,58 @@ def extract_and_import_mesh(controller, action):
         vertex_byte_stride = vbuffer.byteStride
         estimated_vertex_size = action.numIndices * vertex_byte_stride
         vertex_data = controller.GetBufferData(vbuffer.resourceId, vbuffer.byteOffset, estimated_vertex_size)
+        vertex_count = len(vertex_data) // vertex_byte_stride
 
-        positions = []
-        for i in range(0, len(vertex_data), vertex_byte_stride):
-            x, y, z = struct.unpack_from('fff', vertex_data, i)
-            positions.append((x, y, z))
+        positions = decode_vertex_attribute(vertex_data, vertex_count, vertex_byte_stride, position_elem, 3)
+        if positions is None:
+            logging.warning(f"Unsupported position format for action {action.eventId}. Skipping.")
+            return
 
         uv_data = None
         if uv_elem:
-            uv_data = []
-            uv_offset = uv_elem.byteOffset
-            for i in range(0, len(vertex_data), vertex_byte_stride):
-                u, v = struct.unpack_from('ff', vertex_data, i + uv_offset)
-                uv_data.append((u, 1 - v))
+            uv_data = decode_vertex_attribute(vertex_data, vertex_count, vertex_byte_stride, uv_elem, 2)
+            if uv_data is not None:
+                uv_data[:, 1] = 1 - uv_data[:, 1]
+
+        normals = None
+        if normal_elem and normal_elem.inputSlot == vb_index:
+            normals = decode_vertex_attribute(vertex_data, vertex_count, vertex_byte_stride, normal_elem, 3)
+            normal_format = getattr(normal_elem, 'format', None)
+            if normals is not None and normal_format is not None and normal_format.compType == rd.CompType.UNorm:
+                # UNorm normals are packed from [-1, 1] into [0, 1]
+                normals = normals * 2.0 - 1.0
+        if normals is None:
+            logging.info(f"No usable normal attribute for action {action.eventId}, falling back to auto smooth.")
 
         index_data = controller.GetBufferData(ibuffer.resourceId, ibuffer.byteOffset, action.numIndices * index_byte_stride)
-        indices = []
-        for i in range(0, len(index_data), index_byte_stride):
-            if index_byte_stride == 2:
-                indices.append(struct.unpack_from('H', index_data, i)[0])
-            else:
-                indices.append(struct.unpack_from('I', index_data, i)[0])
+        index_dtype = np.dtype('<u2') if index_byte_stride == 2 else np.dtype('<u4')
+        indices = np.frombuffer(index_data, dtype=index_dtype, count=len(index_data) // index_byte_stride)
 
         if len(positions) > MAX_VERTICES or len(indices) > MAX_INDICES:
             logging.warning(f"Skipping mesh {action.eventId} due to size limit.")
             return
 
+        topology = get_primitive_topology(controller)
+        restart_index = np.iinfo(index_dtype).max
+        indices = convert_to_triangle_list(indices, topology, restart_index, len(positions))
+        if indices is None:
+            logging.info(f"Unsupported primitive topology {topology} for action {action.eventId}. Skipping.")
+            return
+
+        if compact_meshes:
+            vertex_count = len(positions)
+            positions, indices, uv_data, normals = compact_vertices(positions, indices, uv_data, normals)
+            logging.info(f"Compacted mesh {action.eventId} from {vertex_count} to {len(positions)} vertices.")
+
         mesh_name = f"Mesh_{action.eventId}"
-        create_mesh_in_blender(positions, indices, uv_data, mesh_name)
+        create_mesh_in_blender(positions, indices, uv_data, mesh_name, normals)
 
     except Exception as e:
         logging.error(f"Failed to extract and import mesh for action {action.eventId}: {e}")
 
 
-def create_mesh_in_blender(positions, indices, uvs, mesh_name):
-    if not positions or not indices:
+def create_mesh_in_blender(positions, indices, uvs, mesh_name, normals=None):
+    if positions is None or not len(positions) or not len(indices):
         logging.warning(f"No positions or indices provided for mesh {mesh_name}.")
         return
 
@@ -423,7 +591,7 @@ def create_mesh_in_blender(positions, indices, uvs, mesh_name):
         return
 
     # Construct faces as a list of tuples
-    faces = [indices[i:i+3] for i in range(0, len(indices), 3)]
+    faces = np.asarray(indices).reshape(-1, 3).tolist()
 
     # Log a sample of faces to debug the structure
     logging.info(f"Sample faces: {faces[:5]}")
@@ -431,37 +599,46 @@ def create_mesh_in_blender(positions, indices, uvs, mesh_name):
     # Create the mesh using the vertices and faces
     mesh.from_pydata(positions, [], faces)
 
-    if uvs:
+    if uvs is not None:
         uv_layer = mesh.uv_layers.new(name="UVMap")
         mesh.uv_layers.active = uv_layer
-        uv_data = uv_layer.data
-        for loop in mesh.loops:
-            uv_data[loop.index].uv = uvs[loop.vertex_index]
+        loop_vertex_indices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+        uv_layer.data.foreach_set("uv", uvs[loop_vertex_indices].ravel())
 
     # Update the mesh
     mesh.update()
 
     # Shade the mesh smooth
-    for face in mesh.polygons:
-        face.use_smooth = True
-
-    # Enable Auto Smooth with a 30-degree angle
-    mesh.use_auto_smooth = True
-    mesh.auto_smooth_angle = 0.698132  # 30 degrees in radians
-
-    logging.info(f"Mesh {mesh_name} created in Blender with UVs and auto smooth enabled.")
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+
+    if normals is not None:
+        # Use the captured normals as custom split normals so shading matches the game
+        if hasattr(mesh, "use_auto_smooth"):
+            # Blender versions before 4.1 only evaluate custom normals with auto smooth enabled.
+            # A 180 degree angle keeps it from splitting any edges itself.
+            mesh.use_auto_smooth = True
+            mesh.auto_smooth_angle = math.pi
+        mesh.normals_split_custom_set_from_vertices(normals)
+        logging.info(f"Mesh {mesh_name} created in Blender with UVs and captured normals.")
+    else:
+        # No normals captured, let Blender recompute them with auto smooth
+        if hasattr(mesh, "use_auto_smooth"):
+            mesh.use_auto_smooth = True
+            mesh.auto_smooth_angle = AUTO_SMOOTH_ANGLE
+        logging.info(f"Mesh {mesh_name} created in Blender with UVs and auto smooth enabled.")
 
 
 
 # Process action
-def process_action(controller, action, min_action_id, max_action_id, rdc_file_path):
+def process_action(controller, action, min_action_id, max_action_id, rdc_file_path, compact_meshes=False):
     if max_action_id != -1 and (action.eventId < min_action_id or action.eventId > max_action_id):
         return
 
     textures = extract_and_save_textures(controller, action, rdc_file_path)
     material = create_or_get_material(action.eventId)
     assign_textures_to_nodes(material, textures)
-    extract_and_import_mesh(controller, action)
+    extract_and_import_mesh(controller, action, compact_meshes)
 
     mesh_name = f"Mesh_{action.eventId}"
     obj = bpy.data.objects.get(mesh_name)
@@ -490,7 +667,7 @@ def parse_action_ranges(range_str):
     return ranges
 
 # Import meshes from RDC
-def import_meshes_from_rdc(rdc_file_path, min_action_id, max_action_id, manual_ranges):
+def import_meshes_from_rdc(rdc_file_path, min_action_id, max_action_id, manual_ranges, compact_meshes=False):
     setup_logging(rdc_file_path)
     cap = rd.OpenCaptureFile()
     status = cap.OpenFile(rdc_file_path, '', None)
@@ -524,7 +701,7 @@ def import_meshes_from_rdc(rdc_file_path, min_action_id, max_action_id, manual_r
     for action in actions:
         if action.eventId in valid_actions:
             logging.info(f"Processing action: {action.eventId}")
-            process_action(controller, action, min_action_id, max_action_id, rdc_file_path)
+            process_action(controller, action, min_action_id, max_action_id, rdc_file_path, compact_meshes)
         else:
             logging.info(f"Skipping action: {action.eventId}")
 
@@ -0,0 +1,197 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The kernels are plain NumPy modules, imported as top level modules so the
+# add-on package (and with it bpy) is never loaded
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ADDON_DIR, "benchmarks")
+sys.path.insert(0, ADDON_DIR)
+
+import match_assignment
+import mesh_fingerprints
+import voxel_overlap
+
+
+def load_rdc_importer():
+    """
+    Imports rdc_importer, which needs bpy. Without the renderdoc module the
+    stand-in used by the benchmarks provides the topology constants.
+    """
+    pytest.importorskip("bpy")
+    try:
+        import renderdoc
+    except ImportError:
+        sys.path.insert(0, BENCH_DIR)
+        import fake_renderdoc
+        sys.modules["renderdoc"] = fake_renderdoc
+    import rdc_importer
+    return rdc_importer
+
+
+def brute_force_assignment(cost):
+    """
+    Returns the largest number of allowed pairs and their smallest total cost
+    over every one-to-one assignment.
+    """
+    rows, columns = cost.shape
+    best = (0, 0.0)
+    for permutation in itertools.permutations(range(max(rows, columns))):
+        pairs = [(row, column) for row, column in enumerate(permutation[:rows]) if column < columns and np.isfinite(cost[row, column])]
+        total = sum(cost[row, column] for row, column in pairs)
+        if len(pairs) > best[0] or (len(pairs) == best[0] and total < best[1]):
+            best = (len(pairs), total)
+    return best
+
+
+def make_grid(columns, rows):
+    """
+    Returns the vertices and edges of a flat grid, irregularly spaced so its
+    covariance eigenvalues differ.
+    """
+    x, y = np.meshgrid(np.linspace(0.0, 1.0, columns) ** 2, np.linspace(0.0, 0.5, rows))
+    coords = np.stack([x.ravel(), y.ravel(), (x * y).ravel()], axis=1)
+    index = np.arange(columns * rows).reshape(rows, columns)
+    edges = np.concatenate([
+        np.stack([index[:, :-1].ravel(), index[:, 1:].ravel()], axis=1),
+        np.stack([index[:-1].ravel(), index[1:].ravel()], axis=1),
+    ])
+    return coords, edges
+
+
+def rotation(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0.0], [s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def test_solve_assignment_matches_brute_force():
+    rng = np.random.default_rng(1)
+    for _ in range(300):
+        rows, columns = rng.integers(1, 6, size=2)
+        cost = rng.uniform(0.0, 10.0, size=(rows, columns))
+        cost[rng.random((rows, columns)) < 0.4] = np.inf
+
+        pairs = match_assignment.solve_assignment(cost)
+        assert len({row for row, _ in pairs}) == len(pairs)
+        assert len({column for _, column in pairs}) == len(pairs)
+        assert all(np.isfinite(cost[row, column]) for row, column in pairs)
+
+        count, total = brute_force_assignment(cost)
+        assert len(pairs) == count
+        assert sum(cost[row, column] for row, column in pairs) == pytest.approx(total)
+
+
+def test_solve_assignment_without_allowed_pairs():
+    assert match_assignment.solve_assignment(np.full((2, 3), np.inf)) == []
+
+
+def test_assign_candidates_does_not_steal_partners():
+    # Greedy matching gives kn5 0 its nearest RDC 0 and leaves kn5 1 without a partner
+    candidates = [(0, 0, 1.0), (0, 1, 1.5), (1, 0, 1.2), (5, 7, 0.3)]
+    assert match_assignment.assign_candidates(candidates) == [(0, 1, 1.5), (1, 0, 1.2), (5, 7, 0.3)]
+
+
+def test_fingerprints_of_moved_copies_are_compatible():
+    coords, edges = make_grid(6, 5)
+    moved = coords + [10.0, -3.0, 2.0]
+    stretched = coords * [2.0, 1.0, 1.0]
+    table = mesh_fingerprints.stack_fingerprints([
+        mesh_fingerprints.compute_fingerprint(coords, edges, 40),
+        mesh_fingerprints.compute_fingerprint(moved, edges, 40),
+        mesh_fingerprints.compute_fingerprint(stretched, edges, 40),
+    ])
+
+    assert mesh_fingerprints.bucket_key(table, 0) == mesh_fingerprints.bucket_key(table, 1) == (30, 40)
+    assert table["edge_histograms"][0].sum() == len(edges)
+    assert mesh_fingerprints.shape_compatible(table, 0, table, [1, 2]).tolist() == [True, False]
+
+
+def test_rigid_fit_residual_rejects_mirrored_copies():
+    coords, _ = make_grid(6, 5)
+    moved = coords @ rotation(0.7).T + [1.0, 2.0, 3.0]
+    mirrored = coords * [-1.0, 1.0, 1.0]
+
+    assert mesh_fingerprints.rigid_fit_residual(moved, coords) == pytest.approx(0.0, abs=1e-9)
+    assert mesh_fingerprints.rigid_fit_residual(mirrored, coords) > 1e-2
+
+
+def test_subsample_indices_are_stable():
+    indices = mesh_fingerprints.subsample_indices(1000, 64)
+    assert len(indices) == 64
+    assert np.all(np.diff(indices) > 0) and indices[-1] < 1000
+    assert np.array_equal(indices, mesh_fingerprints.subsample_indices(1000, 64))
+    assert np.array_equal(mesh_fingerprints.subsample_indices(10, 64), np.arange(10))
+
+
+def test_split_lod_candidates():
+    pairs = [(0, 0), (1, 1), (1, 2), (2, 3)]
+    residuals = [0.0, 0.0, 0.0, 1.0]
+    accepted, ambiguous = mesh_fingerprints.split_lod_candidates(pairs, residuals, [0.1] * 4, [False] * 4)
+    # Clear pair accepted, contested pairs promoted, bad pair dropped
+    assert accepted == {(0, 0): 0.0}
+    assert ambiguous == [(1, 1), (1, 2)]
+
+    accepted, ambiguous = mesh_fingerprints.split_lod_candidates(pairs, residuals, [0.1] * 4, [True] * 4)
+    assert accepted == {(0, 0): 0.0, (1, 1): 0.0, (1, 2): 0.0}
+    assert ambiguous == []
+
+
+def test_pick_threshold():
+    threshold = mesh_fingerprints.pick_threshold([1e-6] * 5 + [1.0] * 3)
+    assert 1e-3 <= threshold < 1.0
+    assert mesh_fingerprints.pick_threshold([0.1, 0.2, 0.3]) is None
+
+    histogram = mesh_fingerprints.distance_histogram([0.0, 0.5, 5.0])
+    assert sum(count for _, _, count in histogram) == 3
+
+
+def test_voxel_overlap_finds_shifted_copy():
+    rng = np.random.default_rng(2)
+    voxel_size = 0.01
+    coords = rng.uniform(0.0, 1.0, size=(500, 3))
+    far = coords + 10.0
+    table = voxel_overlap.build_voxel_table([coords, far], voxel_size)
+    assert table[2].tolist() == [len(np.unique(table[0][table[1] == 0])), len(np.unique(table[0][table[1] == 1]))]
+
+    # Less than half a voxel off still lands in the cells of the original
+    shifted = coords + voxel_size * 0.4
+    half = coords[:250]
+    meshes, owners, fractions = voxel_overlap.score_overlaps(table, [shifted, half, far + 5.0], voxel_size)
+    assert meshes.tolist() == [0, 1]
+    assert owners.tolist() == [0, 0]
+    assert fractions.tolist() == [1.0, 1.0]
+
+    assigned = voxel_overlap.assign_overlaps(meshes, owners, fractions, table[2], 0.95)
+    assert assigned == {0: (0, 1.0), 1: (0, 1.0)}
+
+
+def test_convert_to_triangle_list():
+    rdc_importer = load_rdc_importer()
+    topology = sys.modules["renderdoc"].Topology
+    restart = 0xFFFF
+
+    strip = [0, 1, 2, 3, restart, 4, 5, 6]
+    triangles = rdc_importer.convert_to_triangle_list(strip, topology.TriangleStrip, restart, 7)
+    # Odd triangles of a strip get their winding flipped back
+    assert triangles.tolist() == [0, 1, 2, 2, 1, 3, 4, 5, 6]
+
+    # Degenerate triangles and triangles past the vertex data are dropped
+    triangles = rdc_importer.convert_to_triangle_list([0, 1, 2, 2, 2, 3, 4, 5, 9], topology.TriangleList, restart, 6)
+    assert triangles.tolist() == [0, 1, 2]
+
+    assert rdc_importer.convert_to_triangle_list([0, 1], topology.LineList, restart, 2) is None
+
+
+def test_compact_vertices_welds_duplicates():
+    rdc_importer = load_rdc_importer()
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 0], [5, 5, 5]], dtype=np.float32)
+    uvs = np.array([[0, 0], [1, 0], [0, 1], [0, 0], [1, 1]], dtype=np.float32)
+
+    compacted, indices, compacted_uvs, normals = rdc_importer.compact_vertices(positions, [0, 1, 2, 3, 2, 1], uvs)
+    assert compacted.tolist() == positions[:3].tolist()
+    assert compacted_uvs.tolist() == uvs[:3].tolist()
+    assert indices.tolist() == [0, 1, 2, 0, 2, 1]
+    assert normals is None
@@ -0,0 +1,123 @@
+import bpy
+import hashlib
+import logging
+import numpy as np
+
+# Set up logging
+logger = logging.getLogger("TextureSignatures")
+
+# Texture signatures are sets of image hashes, one per image bound to an object's
+# materials. Each image is hashed from its size and a copy scaled down to a small
+# quantized grid. Hashes are compared for equality only: identical textures
+# always match, but any sample of a re-encoded copy landing on the other side of
+# a quantization step changes the hash, so such copies are not guaranteed to
+# match. Images smaller than 2x2 are placeholders and ignored. Bump the version
+# whenever the hash contents change.
+IMAGE_SIGNATURE_PROPERTY = "rdac_image_signature"
+IMAGE_SIGNATURE_VERSION = 2
+IMAGE_SAMPLE_GRID = 8
+IMAGE_QUANTIZE_LEVELS = 16
+IMAGE_MIN_SIZE = 2
+
+# Cost added to a contested pair whose textures share nothing, small enough to
+# only decide between candidates that are otherwise equally good
+TEXTURE_TIE_BREAK = 1e-6
+
+
+def hash_image_pixels(samples, width, height):
+    """
+    Hashes the flat RGBA float pixels of an image scaled down to
+    IMAGE_SAMPLE_GRID x IMAGE_SAMPLE_GRID, together with the original size.
+    Quantizing to IMAGE_QUANTIZE_LEVELS keeps the hash off the exact float
+    values, it does not make nearby pixels hash equal.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    quantized = np.rint(np.clip(samples, 0.0, 1.0) * (IMAGE_QUANTIZE_LEVELS - 1)).astype(np.uint8)
+
+    digest = hashlib.blake2b(np.array([width, height], dtype='<i8').tobytes() + quantized.tobytes(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') >> 1
+
+
+def get_image_signature(image):
+    """
+    Returns the hash of an image, or None for images without pixels or smaller
+    than 2x2. The pixels are read from a scaled down copy, so the full image is
+    never converted to floats. The hash is cached on the image and reused until
+    its size or file path changes.
+    """
+    width, height = image.size
+    if width < IMAGE_MIN_SIZE or height < IMAGE_MIN_SIZE:
+        return None
+
+    key = f"{IMAGE_SIGNATURE_VERSION}:{width}x{height}:{image.filepath}"
+    cached = image.get(IMAGE_SIGNATURE_PROPERTY)
+    if cached and cached.get("key") == key:
+        return int(cached["hash"], 16)
+
+    thumbnail = image.copy()
+    try:
+        thumbnail.scale(IMAGE_SAMPLE_GRID, IMAGE_SAMPLE_GRID)
+        samples = np.empty(IMAGE_SAMPLE_GRID * IMAGE_SAMPLE_GRID * 4, dtype=np.float32)
+        thumbnail.pixels.foreach_get(samples)
+    except RuntimeError as e:
+        logger.warning(f"Could not read the pixels of image '{image.name}': {e}")
+        return None
+    finally:
+        bpy.data.images.remove(thumbnail)
+
+    signature = hash_image_pixels(samples, width, height)
+    # Custom property integers are only 32 bits wide, store the hash as text
+    image[IMAGE_SIGNATURE_PROPERTY] = {"key": key, "hash": format(signature, 'x')}
+    return signature
+
+
+def get_object_texture_signature(obj, image_cache=None):
+    """
+    Returns the set of hashes of the images used by the image texture nodes of
+    an object's materials. image_cache maps images to their hashes within one run.
+    """
+    image_cache = {} if image_cache is None else image_cache
+    signature = set()
+    for slot in obj.material_slots:
+        material = slot.material
+        if not material or not material.use_nodes or not material.node_tree:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type != 'TEX_IMAGE' or not node.image:
+                continue
+            if node.image not in image_cache:
+                image_cache[node.image] = get_image_signature(node.image)
+            if image_cache[node.image] is not None:
+                signature.add(image_cache[node.image])
+    return frozenset(signature)
+
+
+def textures_compatible(signature, other_signature):
+    """
+    Returns whether two objects share at least one texture. Objects without
+    texture signatures share none, callers decide whether to skip the check.
+    """
+    return not signature.isdisjoint(other_signature)
+
+
+def texture_similarity(signature, other_signature):
+    """
+    Returns the Jaccard similarity of two texture signatures, 0 when either is empty.
+    """
+    if not signature or not other_signature:
+        return 0.0
+    return len(signature & other_signature) / len(signature | other_signature)
+
+
+class TextureSignatureCache:
+    """
+    Computes the texture signatures of objects on first use within one matching run.
+    """
+    def __init__(self):
+        self.images = {}
+        self.objects = {}
+
+    def get(self, obj):
+        if obj not in self.objects:
+            self.objects[obj] = get_object_texture_signature(obj, self.images)
+        return self.objects[obj]
@@ -0,0 +1,114 @@
+import numpy as np
+
+# Partial overlap matching for draws that split or merge meshes differently
+# than the kn5. Vertex positions of both sides are quantized into a voxel hash
+# and compared with sorted array lookups. Only NumPy is used here so the same
+# code can run outside of Blender.
+
+# Quantized coordinates are packed into one int64 key with this many bits per
+# axis. Cells further apart than 2**21 voxels wrap around and can collide.
+KEY_BITS = 21
+KEY_MASK = (1 << KEY_BITS) - 1
+
+# The 8 cells around a point, see build_voxel_table
+CELL_CORNERS = np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.int64)
+
+
+def pack_cells(cells):
+    """
+    Packs (N, 3) integer cell coordinates into N int64 keys.
+    """
+    cells = cells & KEY_MASK
+    return cells[:, 0] | (cells[:, 1] << KEY_BITS) | (cells[:, 2] << (2 * KEY_BITS))
+
+
+def point_keys(coords, voxel_size):
+    """
+    Returns the key of the cell holding each of the (N, 3) points.
+    """
+    return pack_cells(np.floor(np.asarray(coords, dtype=np.float64) / voxel_size).astype(np.int64))
+
+
+def build_voxel_table(coords_list, voxel_size):
+    """
+    Builds the voxel hash of several meshes, given as a list of (N, 3) vertex
+    arrays. Every vertex marks the 8 cells whose centers lie within half a voxel
+    of it on each axis, so points of another mesh less than half a voxel away
+    always find it, whichever side of a cell border they fall on.
+    Returns the sorted unique cell keys, the mesh index owning each key entry and
+    the number of cells each mesh marks.
+    """
+    keys = []
+    owners = []
+    for index, coords in enumerate(coords_list):
+        if not len(coords):
+            continue
+        base = np.floor(np.asarray(coords, dtype=np.float64) / voxel_size - 0.5).astype(np.int64)
+        cells = (base[:, None, :] + CELL_CORNERS[None, :, :]).reshape(-1, 3)
+        mesh_keys = np.unique(pack_cells(cells))
+        keys.append(mesh_keys)
+        owners.append(np.full(len(mesh_keys), index, dtype=np.int64))
+
+    if not keys:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, np.zeros(len(coords_list), dtype=np.int64)
+
+    keys = np.concatenate(keys)
+    owners = np.concatenate(owners)
+    order = np.lexsort((owners, keys))
+    return keys[order], owners[order], np.bincount(owners, minlength=len(coords_list))
+
+
+def score_overlaps(table, coords_list, voxel_size):
+    """
+    Looks up the vertices of several meshes, given as a list of (N, 3) vertex
+    arrays, in a voxel table from build_voxel_table. Returns three parallel
+    arrays: the index of the looked up mesh, the index of a table mesh, and the
+    fraction of the looked up mesh's vertices landing in that table mesh's cells.
+    Only pairs with at least one shared vertex are returned.
+    """
+    table_keys, table_owners, _ = table
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0))
+    counts = np.array([len(coords) for coords in coords_list], dtype=np.int64)
+    if not len(table_keys) or not counts.sum():
+        return empty
+
+    keys = point_keys(np.concatenate([np.asarray(coords).reshape(-1, 3) for coords in coords_list]), voxel_size)
+    mesh_of_vertex = np.repeat(np.arange(len(coords_list), dtype=np.int64), counts)
+
+    # Every key can be owned by several table meshes, expand the matching ranges
+    starts = np.searchsorted(table_keys, keys, side='left')
+    hit_counts = np.searchsorted(table_keys, keys, side='right') - starts
+    total = int(hit_counts.sum())
+    if not total:
+        return empty
+
+    first_hit = np.cumsum(hit_counts) - hit_counts
+    positions = np.repeat(starts, hit_counts) + np.arange(total) - np.repeat(first_hit, hit_counts)
+    hit_owners = table_owners[positions]
+    hit_meshes = np.repeat(mesh_of_vertex, hit_counts)
+
+    # Each vertex hits an owner at most once, so counting pairs counts vertices
+    owner_count = int(table_owners.max()) + 1
+    pairs, shared = np.unique(hit_meshes * owner_count + hit_owners, return_counts=True)
+    meshes = pairs // owner_count
+    return meshes, pairs % owner_count, shared / counts[meshes]
+
+
+def assign_overlaps(meshes, owners, fractions, owner_cell_counts, min_fraction):
+    """
+    Assigns every looked up mesh to the table mesh holding the largest fraction
+    of its vertices, if that fraction reaches min_fraction. Ties go to the table
+    mesh with fewer cells, the tighter fit. Several meshes can be assigned to
+    the same table mesh. Returns a dictionary mapping mesh to (owner, fraction).
+    """
+    keep = fractions >= min_fraction
+    meshes, owners, fractions = meshes[keep], owners[keep], fractions[keep]
+
+    # Best first, so the first entry of every mesh wins
+    order = np.lexsort((owner_cell_counts[owners], -fractions, meshes))
+    meshes, owners, fractions = meshes[order], owners[order], fractions[order]
+    first = np.ones(len(meshes), dtype=bool)
+    first[1:] = meshes[1:] != meshes[:-1]
+
+    return {int(mesh): (int(owner), float(fraction)) for mesh, owner, fraction in zip(meshes[first], owners[first], fractions[first])}